@@ -1,8 +1,28 @@
-from flask import Flask, request
+import time
+# Module load time is reported by /health (workers pay it on every boot unless preloaded)
+_load_started = time.perf_counter()
+
+from flask import Flask, Response, request, stream_with_context
 import os
+import json
+import asyncio
+import tempfile
+import click
+from concurrent.futures import ThreadPoolExecutor
 from utils.news_scraper import NewsScraper
 from utils.sentiment_analyzer import SentimentAnalyzer
-from utils.html_generator import generate_html_page
+from utils.parallel_scoring import ParallelScorer, default_workers
+from utils.cache import TTLCache, create_cache
+from utils.article_store import ArticleStore
+from utils.single_flight import SingleFlight
+from utils.source_index import SourceIndex
+from utils.prefetch import PrefetchScheduler
+from utils.incremental import TopicState
+from utils.json_api import parse_fields, results_payload, encode_json, compress, results_etag
+from utils.article_filter import ArticleFilter
+from utils.aggregation import SentimentAggregate
+from utils.instrumentation import metrics
+from utils.html_generator import generate_html_page, iter_html_page_streaming, CSS, CSS_ETAG
 from datetime import datetime
 
 app = Flask(__name__)
@@ -10,10 +30,91 @@ app.config['SECRET_KEY'] = os.environ.get('FLASK_SECRET_KEY', 'dev-secret-key-ch
 
 # Initialize scraper and analyzer
 news_scraper = NewsScraper(
-    api_key=os.environ.get('NEWS_API_KEY')
+    api_key=os.environ.get('NEWS_API_KEY'),
+    # Set SCRAPE_CACHE_PATH to share the cache between workers through SQLite
+    cache=create_cache(
+        path=os.environ.get('SCRAPE_CACHE_PATH'),
+        max_entries=int(os.environ.get('SCRAPE_CACHE_SIZE', 256)),
+        ttl=int(os.environ.get('SCRAPE_CACHE_TTL', 600))
+    ),
+    # NEWS_API_URL points the scraper at another endpoint (e.g. the benchmark stub server)
+    base_url=os.environ.get('NEWS_API_URL', 'https://newsapi.org/v2/everything'),
+    max_workers=int(os.environ.get('SCRAPE_WORKERS', 4)),
+    pool_size=int(os.environ.get('SCRAPE_POOL_SIZE', 10)),
+    max_retries=int(os.environ.get('SCRAPE_MAX_RETRIES', 3)),
+    retry_budget=float(os.environ.get('SCRAPE_RETRY_BUDGET', 10)),
+    # Set ARTICLE_STORE_PATH to keep every fetched article in a local full-text index;
+    # ARTICLE_STORE_MODE=query then serves already covered topics from it, refetching a
+    # topic once its last fetch is older than ARTICLE_STORE_MAX_AGE seconds (default 1 hour)
+    store=ArticleStore(os.environ['ARTICLE_STORE_PATH']) if os.environ.get('ARTICLE_STORE_PATH') else None,
+    store_mode=os.environ.get('ARTICLE_STORE_MODE', 'write'),
+    store_max_age=int(os.environ.get('ARTICLE_STORE_MAX_AGE', 3600))
+)
+
+# Articles fetched per topic (pages of 100 are fetched concurrently)
+ARTICLE_LIMIT = int(os.environ.get('ARTICLE_LIMIT', 100))
+
+# Incremental mode: repeat analyses fetch and score only articles newer than the last run.
+# A topic is refreshed from News API at most every INCREMENTAL_REFRESH_INTERVAL seconds
+# (default: the scrape cache TTL); its state is rebuilt from a full run after INCREMENTAL_STATE_TTL
+INCREMENTAL_ANALYSIS = os.environ.get('INCREMENTAL_ANALYSIS', '').lower() in ('1', 'true', 'yes')
+INCREMENTAL_REFRESH_INTERVAL = int(os.environ.get('INCREMENTAL_REFRESH_INTERVAL', os.environ.get('SCRAPE_CACHE_TTL', 600)))
+# Refreshes page through everything published since the last one, up to this many articles
+INCREMENTAL_REFRESH_LIMIT = int(os.environ.get('INCREMENTAL_REFRESH_LIMIT', 1000))
+topic_states = TTLCache(
+    max_entries=int(os.environ.get('INCREMENTAL_STATE_SIZE', 200)),
+    ttl=int(os.environ.get('INCREMENTAL_STATE_TTL', 6 * 3600))
+)
+
+# Results served by the JSON API are reused (and revalidated by ETag) for RESULTS_CACHE_TTL seconds
+results_cache = TTLCache(
+    max_entries=int(os.environ.get('RESULTS_CACHE_SIZE', 256)),
+    ttl=int(os.environ.get('RESULTS_CACHE_TTL', 60))
 )
 
-sentiment_analyzer = SentimentAnalyzer()
+# Bulk analysis: maximum topics per request and concurrent topic fetches
+BULK_MAX_TOPICS = int(os.environ.get('BULK_MAX_TOPICS', 100))
+BULK_FETCH_WORKERS = int(os.environ.get('BULK_FETCH_WORKERS', 8))
+
+# Stream /analyze pages so the header and form reach the browser before analysis finishes
+STREAM_RESPONSES = os.environ.get('STREAM_RESPONSES', '').lower() in ('1', 'true', 'yes')
+
+sentiment_analyzer = SentimentAnalyzer(
+    # Results are keyed by content hash; set SENTIMENT_CACHE_PATH to persist them
+    cache=create_cache(
+        path=os.environ.get('SENTIMENT_CACHE_PATH'),
+        max_entries=int(os.environ.get('SENTIMENT_CACHE_SIZE', 20000)),
+        ttl=None
+    ),
+    # 'textblob' (default), 'lexicon' (much faster, slightly less accurate)
+    # or 'onnx' (local quantized transformer, see utils/onnx_backend.py)
+    backend=os.environ.get('SENTIMENT_BACKEND', 'textblob'),
+    model_options={
+        'model_dir': os.environ.get('SENTIMENT_MODEL_DIR', 'models/sentiment'),
+        'threads': int(os.environ.get('SENTIMENT_MODEL_THREADS', 0)) or None,
+        'max_batch_size': int(os.environ.get('SENTIMENT_MODEL_BATCH', 32)),
+        'batch_wait_ms': float(os.environ.get('SENTIMENT_MODEL_BATCH_WAIT_MS', 2)),
+        'max_length': int(os.environ.get('SENTIMENT_MODEL_MAX_LENGTH', 128))
+    }
+)
+
+# Scoring mode: 'serial' (in the request thread) or 'process' (persistent process pool)
+sentiment_scorer = ParallelScorer(
+    sentiment_analyzer,
+    mode=os.environ.get('SCORING_MODE', 'serial'),
+    # Pool processes per server worker; by default the cores are split between the
+    # WEB_CONCURRENCY server workers (gunicorn.conf.py uses gunicorn's actual count)
+    workers=int(os.environ.get('SCORING_WORKERS', 0)) or default_workers(int(os.environ.get('WEB_CONCURRENCY', 1))),
+    min_batch_size=int(os.environ.get('SCORING_MIN_BATCH', 40))
+)
+
+# Coalesce concurrent analyses of the same topic; SINGLE_FLIGHT_DIR extends this across workers
+single_flight_dir = os.environ.get('SINGLE_FLIGHT_DIR')
+topic_flight = SingleFlight(
+    lock_dir=single_flight_dir,
+    store=create_cache(path=os.path.join(single_flight_dir, 'results.db')) if single_flight_dir else None,
+    share_ttl=int(os.environ.get('SINGLE_FLIGHT_SHARE_TTL', 10))
+)
 
 # More balanced credible sources list
 CREDIBLE_SOURCES = {
@@ -45,65 +146,340 @@ CREDIBLE_SOURCES = {
     'Billboard', 'Pitchfork', 'IGN', 'GameSpot', 'Polygon'
 }
 
-def is_credible_source(source_name):
-    """Check if a source is credible"""
-    if not source_name:
-        return False
+# Precompiled index over CREDIBLE_SOURCES (exact, partial and memoized lookups)
+credible_index = SourceIndex(CREDIBLE_SOURCES)
+
+class AnalysisError(Exception):
+    """Analysis failure whose message is shown to the user as-is"""
+
+def analyze_topic(topic):
+    """
+    Run the analysis pipeline for a topic: scrape, filter and score articles
+    Returns the results dict, raises AnalysisError with a user-facing message
+    """
+    # Scrape news articles
+    try:
+        all_articles = news_scraper.scrape(topic, limit=ARTICLE_LIMIT)
+    except Exception as e:
+        raise AnalysisError(str(e))
+    
+    return build_results(topic, all_articles)
+
+def analyze_topic_incremental(topic):
+    """
+    Incremental variant of analyze_topic: after a first full run, only articles
+    published since the newest one seen are fetched and scored, and they are
+    merged into the topic's running counts, extremes and source tallies
+    """
+    key = news_scraper.normalize_topic(topic)
+    state = topic_states.get(key)
+    
+    if state is None:
+        try:
+            fetched = news_scraper.scrape(topic, limit=ARTICLE_LIMIT)
+        except Exception as e:
+            raise AnalysisError(str(e))
+        if not fetched:
+            raise AnalysisError(f'No news articles found for "{topic}". Try different keywords or a broader topic.')
+        
+        state = TopicState()
+        merge_new_articles(topic, state, fetched, complete=True)
+        topic_states.set(key, state)
+        return state.results(topic)
+    
+    # Recently refreshed: serve the running state without spending News API quota
+    if state.age() < INCREMENTAL_REFRESH_INTERVAL:
+        return state.results(topic)
+    
+    # One refresh per topic at a time: the async pipeline and the Flask routes
+    # coalesce through different flights, and merging a batch twice double counts
+    with state.lock:
+        if state.age() < INCREMENTAL_REFRESH_INTERVAL:
+            return state.results(topic)
+        
+        try:
+            fetched, complete = news_scraper.scrape_since(topic, state.since(), limit=INCREMENTAL_REFRESH_LIMIT)
+        except Exception as e:
+            raise AnalysisError(str(e))
+        
+        merge_new_articles(topic, state, state.unseen(fetched), complete)
+        return state.results(topic)
+
+def merge_new_articles(topic, state, new_articles, complete):
+    """Filter and score articles not seen before and merge them into a topic state"""
+    with metrics.stage('filter'):
+        article_filter = ArticleFilter(topic, credible_index)
+        relevant, credible = article_filter.split(new_articles)
+    
+    if state.credible_only is None:
+        # Same rule as ArticleFilter.select, fixed for the lifetime of the state
+        state.credible_only = len(credible) >= article_filter.min_credible
+    selected = credible if state.credible_only else relevant
+    
+    if state.refreshed_at is None and not selected:
+        raise AnalysisError(f'No relevant news articles found for "{topic}". Try using different keywords or a more specific/general topic.')
+    
+    score_articles(selected)
+    state.merge(new_articles, selected, complete)
+
+async def analyze_topic_async(topic):
+    """
+    Async variant of analyze_topic: the fetch is awaited on the event loop and
+    the CPU-bound filtering and scoring run in an executor
+    """
+    loop = asyncio.get_running_loop()
+    if INCREMENTAL_ANALYSIS:
+        # Through topic_flight, like the Flask routes, so both share one refresh per topic
+        return await loop.run_in_executor(None, analyze_topic_shared, topic)
+    
+    try:
+        all_articles = await news_scraper.ascrape(topic, limit=ARTICLE_LIMIT)
+    except Exception as e:
+        raise AnalysisError(str(e))
+    
+    return await loop.run_in_executor(None, build_results, topic, all_articles)
+
+def build_results(topic, all_articles):
+    """Filter and score fetched articles and build the results dict"""
+    quality_articles = select_articles(topic, all_articles)
     
-    source_lower = source_name.lower().strip()
+    # Analyze sentiment for each article
+    score_articles(quality_articles)
+    
+    return summarize_results(topic, all_articles, quality_articles)
+
+def select_articles(topic, all_articles):
+    """Return the articles worth scoring, raising AnalysisError if there are none"""
+    if not all_articles:
+        raise AnalysisError(f'No news articles found for "{topic}". Try different keywords or a broader topic.')
     
-    # Check for exact or partial matches
-    for credible in CREDIBLE_SOURCES:
-        credible_lower = credible.lower()
-        if credible_lower == source_lower:
-            return True
-        if credible_lower in source_lower or source_lower in credible_lower:
-            return True
+    # Filter for quality, relevance and credibility in one pass; if the credible
+    # filter is too strict, this falls back to all relevant articles
+    with metrics.stage('filter'):
+        article_filter = ArticleFilter(topic, credible_index)
+        quality_articles = article_filter.select(all_articles)
+    metrics.incr('articles_selected', len(quality_articles))
     
-    # Allow sources with .com, .org, .net extensions (common for news sites)
-    # but exclude obvious spam/low quality domains
-    spam_indicators = ['blog', 'wordpress', 'medium.com', 'tumblr', 'facebook', 'twitter']
-    if any(indicator in source_lower for indicator in spam_indicators):
-        return False
+    if not quality_articles:
+        raise AnalysisError(f'No relevant news articles found for "{topic}". Try using different keywords or a more specific/general topic.')
     
-    return False
+    return quality_articles
 
-def check_relevance(article, topic):
-    """Check if article is relevant to the topic"""
-    topic_lower = topic.lower()
-    text_lower = article.get('text', '').lower()
-    title_lower = article.get('title', '').lower()
+def summarize_results(topic, all_articles, analyzed_articles):
+    """Build the results dict from fetched and scored articles"""
+    total = len(analyzed_articles)
     
-    # Topic keywords
-    topic_words = set(topic_lower.split())
+    # Prepare results
+    results = {
+        'topic': topic,
+        'timestamp': datetime.now().isoformat(),
+        'articles': analyzed_articles[:100],
+        'total_articles': total,
+        'total_found': len(all_articles),
+        'filtered_count': len(all_articles) - total
+    }
     
-    # Count how many topic words appear in title or text
-    matches_in_title = sum(1 for word in topic_words if len(word) > 2 and word in title_lower)
-    matches_in_text = sum(1 for word in topic_words if len(word) > 2 and word in text_lower)
+    # Counts, percentages, extreme examples and source distribution
+    with metrics.stage('aggregate'):
+        aggregate = SentimentAggregate()
+        aggregate.extend(analyzed_articles)
+        results.update(aggregate.summary())
     
-    # Article is relevant if topic words appear in title or multiple times in text
-    if matches_in_title > 0 or matches_in_text >= 2:
-        return True
+    return results
+
+def score_articles(articles):
+    """Score articles, setting their sentiment and confidence"""
+    with metrics.stage('score'):
+        sentiments = sentiment_scorer.score([a.text for a in articles])
+    metrics.incr('articles_scored', len(articles))
     
-    # Also check for full topic phrase
-    if topic_lower in title_lower or topic_lower in text_lower:
-        return True
+    for article, sentiment in zip(articles, sentiments):
+        article.sentiment = sentiment['label']
+        article.confidence = sentiment['score']
+
+def analyze_topics_bulk(topics):
+    """
+    Analyze several topics at once: fetch them concurrently, score every distinct
+    article text exactly once across all topics, then build per-topic results
+    Returns a dict mapping each topic to its results, or to an AnalysisError
+    """
+    # One entry per normalized topic, keeping the first spelling
+    unique_topics = {}
+    for topic in topics:
+        topic = (topic or '').strip()
+        if topic:
+            unique_topics.setdefault(news_scraper.normalize_topic(topic), topic)
+    topics = list(unique_topics.values())
     
-    return False
+    def fetch(topic):
+        try:
+            return news_scraper.scrape(topic, limit=ARTICLE_LIMIT)
+        except Exception as e:
+            return AnalysisError(str(e))
+    
+    with ThreadPoolExecutor(max_workers=BULK_FETCH_WORKERS) as executor:
+        fetched = dict(zip(topics, executor.map(fetch, topics)))
+    
+    outcomes = {}
+    selected = {}
+    for topic in topics:
+        if isinstance(fetched[topic], AnalysisError):
+            outcomes[topic] = fetched[topic]
+            continue
+        try:
+            selected[topic] = select_articles(topic, fetched[topic])
+        except AnalysisError as e:
+            outcomes[topic] = e
+    
+    # Score the union of selected articles, once per distinct text
+    unique_texts = list(dict.fromkeys(a.text for articles in selected.values() for a in articles))
+    scores = dict(zip(unique_texts, sentiment_scorer.score(unique_texts)))
+    
+    for topic, articles in selected.items():
+        for article in articles:
+            sentiment = scores[article.text]
+            article.sentiment = sentiment['label']
+            article.confidence = sentiment['score']
+        outcomes[topic] = summarize_results(topic, fetched[topic], articles)
+    
+    return {topic: outcomes[topic] for topic in topics}
+
+def analyze_topic_shared(topic):
+    """
+    Run analyze_topic, sharing a single computation between concurrent
+    requests for the same normalized topic
+    """
+    key = f'analysis|{news_scraper.normalize_topic(topic)}'
+    analyze_fn = analyze_topic_incremental if INCREMENTAL_ANALYSIS else analyze_topic
+    return topic_flight.do(key, lambda: analyze_fn(topic))
+
+# In-flight async analyses, keyed like analyze_topic_shared (one event loop per process)
+_async_flights = {}
+
+async def analyze_topic_shared_async(topic):
+    """Async variant of analyze_topic_shared"""
+    key = f'analysis|{news_scraper.normalize_topic(topic)}'
+    task = _async_flights.get(key)
+    if task is None:
+        task = asyncio.ensure_future(analyze_topic_async(topic))
+        _async_flights[key] = task
+        task.add_done_callback(lambda _: _async_flights.pop(key, None))
+    # Shield so one disconnecting client does not cancel the analysis for the others
+    return await asyncio.shield(task)
 
-def validate_article_quality(article):
-    """Validate that article has meaningful content"""
-    text = article.get('text', '')
+async def analyze_page_async(topic):
+    """Render the /analyze page for a topic with the async pipeline"""
+    topic = (topic or '').strip()
+    is_configured = news_scraper.is_configured()
+    
+    if not topic:
+        return generate_html_page(
+            is_configured=is_configured,
+            error='Please enter a topic to analyze',
+            results=None,
+            topic=topic
+        )
+    
+    if not is_configured:
+        return generate_html_page(
+            is_configured=False,
+            error='News API is not configured. Please add your NEWS_API_KEY to environment variables.',
+            results=None,
+            topic=topic
+        )
     
-    # Minimum length check
-    if len(text) < 30:
-        return False
+    record_topic_request(topic)
     
-    # Must have some sentence structure
-    if '. ' not in text and len(text) < 80:
-        return False
+    try:
+        results = await analyze_topic_shared_async(topic)
+    except AnalysisError as e:
+        return generate_html_page(is_configured=is_configured, error=str(e), results=None, topic=topic)
+    except Exception as e:
+        return generate_html_page(
+            is_configured=is_configured,
+            error=f'Analysis failed: {str(e)}',
+            results=None,
+            topic=topic
+        )
     
-    return True
+    # Rendering the results page is CPU work too: keep it off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, lambda: generate_html_page(is_configured=is_configured, results=results, error=None, topic=topic)
+    )
+
+def refresh_topic(topic):
+    """Re-fetch a topic and re-score it, replacing its cached articles"""
+    articles = news_scraper.scrape(topic, limit=ARTICLE_LIMIT, refresh=True)
+    try:
+        # Scoring fills the sentiment cache for the next interactive request
+        build_results(topic, articles)
+    except AnalysisError:
+        pass
+
+# Background refresh of the hottest topics before their cached articles expire
+# (disabled unless PREFETCH_TOP_N is set)
+prefetch_scheduler = PrefetchScheduler(
+    refresh=refresh_topic,
+    ttl_remaining=lambda topic: news_scraper.cache_ttl_remaining(topic, ARTICLE_LIMIT),
+    top_n=int(os.environ.get('PREFETCH_TOP_N', 0)),
+    interval=int(os.environ.get('PREFETCH_INTERVAL', 30)),
+    refresh_margin=int(os.environ.get('PREFETCH_MARGIN', 120)),
+    max_concurrency=int(os.environ.get('PREFETCH_CONCURRENCY', 2)),
+    quota_per_hour=int(os.environ.get('PREFETCH_QUOTA_PER_HOUR', 100)),
+    cost_per_refresh=-(-ARTICLE_LIMIT // NewsScraper.PAGE_SIZE),
+    # Only the worker holding this lock file refreshes, so the quota above is a
+    # budget for every worker on the host rather than for each one
+    leader_lock=os.environ.get('PREFETCH_LOCK_PATH', os.path.join(tempfile.gettempdir(), 'social-pulse-prefetch.lock'))
+)
+
+# Per-stage timers and counters for /metrics and the Server-Timing header
+metrics.enabled = os.environ.get('METRICS_ENABLED', 'false').lower() in ('1', 'true', 'yes')
+metrics.register_gauge('scrape_cache', news_scraper.cache_stats)
+metrics.register_gauge('sentiment_cache', sentiment_analyzer.cache_stats)
+metrics.register_gauge('sentiment_model', sentiment_analyzer.model_stats)
+metrics.register_gauge('results_cache', results_cache.stats)
+metrics.register_gauge('single_flight', topic_flight.stats)
+metrics.register_gauge('news_api_http', news_scraper.http_stats)
+
+@app.before_request
+def start_request_timing():
+    metrics.start_request()
+
+@app.after_request
+def add_server_timing(response):
+    if metrics.enabled:
+        server_timing = metrics.server_timing_header()
+        if server_timing:
+            response.headers['Server-Timing'] = server_timing
+    return response
+
+@app.before_request
+def start_prefetch():
+    # Started lazily so the thread runs in each worker rather than a pre-fork master
+    if prefetch_scheduler.top_n > 0 and news_scraper.is_configured():
+        prefetch_scheduler.ensure_started()
+
+def record_topic_request(topic):
+    """Count a topic request for the prefetch scheduler"""
+    if prefetch_scheduler.top_n > 0:
+        prefetch_scheduler.record(news_scraper.normalize_topic(topic), topic)
+
+def stream_analysis_page(topic):
+    """Streaming /analyze response: the page shell is flushed before the pipeline runs"""
+    def compute_results():
+        try:
+            return analyze_topic_shared(topic), None
+        except AnalysisError as e:
+            return None, str(e)
+        except Exception as e:
+            return None, f'Analysis failed: {str(e)}'
+    
+    page = iter_html_page_streaming(news_scraper.is_configured(), topic, compute_results)
+    response = Response(stream_with_context(page), mimetype='text/html')
+    # Ask reverse proxies not to buffer the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/')
 def index():
@@ -139,114 +515,22 @@ def analyze():
             )
             return html
         
-        # Scrape news articles
-        try:
-            all_articles = news_scraper.scrape(topic, limit=100)
-        except Exception as e:
-            html = generate_html_page(
-                is_configured=news_scraper.is_configured(),
-                error=str(e),
-                results=None,
-                topic=topic
-            )
-            return html
-        
-        if not all_articles:
-            html = generate_html_page(
-                is_configured=news_scraper.is_configured(),
-                error=f'No news articles found for "{topic}". Try different keywords or a broader topic.',
-                results=None,
-                topic=topic
-            )
-            return html
-        
-        # Filter for quality and relevance
-        quality_articles = []
-        for article in all_articles:
-            # Check quality first
-            if not validate_article_quality(article):
-                continue
-            
-            # Check relevance to topic
-            if not check_relevance(article, topic):
-                continue
-            
-            # Check if source is credible (more lenient now)
-            if is_credible_source(article.get('source', '')):
-                quality_articles.append(article)
+        record_topic_request(topic)
         
-        # If credible filter is too strict, fall back to all relevant articles
-        if len(quality_articles) < 5:
-            quality_articles = [a for a in all_articles 
-                              if validate_article_quality(a) and check_relevance(a, topic)]
+        if STREAM_RESPONSES:
+            return stream_analysis_page(topic)
         
-        if not quality_articles:
+        try:
+            results = analyze_topic_shared(topic)
+        except AnalysisError as e:
             html = generate_html_page(
                 is_configured=news_scraper.is_configured(),
-                error=f'No relevant news articles found for "{topic}". Try using different keywords or a more specific/general topic.',
+                error=str(e),
                 results=None,
                 topic=topic
             )
             return html
         
-        # Analyze sentiment for each article
-        analyzed_articles = []
-        positive_count = 0
-        negative_count = 0
-        neutral_count = 0
-        
-        for article in quality_articles:
-            sentiment = sentiment_analyzer.analyze(article['text'])
-            article['sentiment'] = sentiment['label']
-            article['confidence'] = sentiment['score']
-            analyzed_articles.append(article)
-            
-            if sentiment['label'] == 'positive':
-                positive_count += 1
-            elif sentiment['label'] == 'negative':
-                negative_count += 1
-            else:
-                neutral_count += 1
-        
-        total = len(analyzed_articles)
-        
-        # Prepare results
-        results = {
-            'topic': topic,
-            'timestamp': datetime.now().isoformat(),
-            'articles': analyzed_articles[:100],
-            'total_articles': total,
-            'total_found': len(all_articles),
-            'filtered_count': len(all_articles) - total,
-            'positive_count': positive_count,
-            'negative_count': negative_count,
-            'neutral_count': neutral_count,
-            'positive_percentage': round((positive_count / total * 100) if total > 0 else 0, 2),
-            'negative_percentage': round((negative_count / total * 100) if total > 0 else 0, 2),
-            'neutral_percentage': round((neutral_count / total * 100) if total > 0 else 0, 2)
-        }
-        
-        # Get extreme examples
-        positive_articles = [a for a in analyzed_articles if a['sentiment'] == 'positive']
-        negative_articles = [a for a in analyzed_articles if a['sentiment'] == 'negative']
-        
-        positive_articles.sort(key=lambda x: x['confidence'], reverse=True)
-        negative_articles.sort(key=lambda x: x['confidence'], reverse=True)
-        
-        results['extreme_examples'] = {
-            'most_positive': positive_articles[:5],
-            'most_negative': negative_articles[:5]
-        }
-        
-        # Get source distribution
-        source_counts = {}
-        for article in analyzed_articles:
-            source = article.get('source', 'Unknown')
-            source_counts[source] = source_counts.get(source, 0) + 1
-        
-        top_sources = sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-        results['top_sources'] = top_sources
-        
         html = generate_html_page(
             is_configured=news_scraper.is_configured(),
             results=results,
@@ -264,13 +548,176 @@ def analyze():
         )
         return html
 
+def get_cached_results(topic):
+    """
+    Return (cache key, results) for a topic from the results cache,
+    running the shared analysis on a miss
+    """
+    key = f'analysis|{news_scraper.normalize_topic(topic)}'
+    results = results_cache.get(key)
+    if results is None:
+        results = analyze_topic_shared(topic)
+        results_cache.set(key, results)
+    return key, results
+
+def api_param(name):
+    """Read an API parameter from a JSON body, form data or the query string"""
+    data = request.get_json(silent=True) if request.is_json else None
+    if isinstance(data, dict) and name in data:
+        value = data[name]
+        return ','.join(value) if isinstance(value, list) else str(value)
+    return request.values.get(name)
+
+@app.route('/api/analyze', methods=['GET', 'POST'])
+def api_analyze():
+    """Analysis results as compact JSON, with field selection, compression and ETags"""
+    topic = (api_param('topic') or '').strip()
+    
+    if not topic:
+        return {'error': 'Please provide a topic to analyze'}, 400
+    
+    if not news_scraper.is_configured():
+        return {'error': 'News API is not configured. Please add your NEWS_API_KEY to environment variables.'}, 503
+    
+    record_topic_request(topic)
+    
+    try:
+        key, results = get_cached_results(topic)
+    except AnalysisError as e:
+        return {'error': str(e)}, 422
+    except Exception as e:
+        return {'error': f'Analysis failed: {str(e)}'}, 500
+    
+    # e.g. fields=positive_percentage,negative_percentage or article_fields=title,url,sentiment
+    fields = parse_fields(api_param('fields'))
+    article_fields = parse_fields(api_param('article_fields'))
+    etag = results_etag(key, results, fields, article_fields)
+    
+    if request.method == 'GET' and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        body = encode_json(results_payload(results, fields, article_fields))
+        body, encoding = compress(body, request.headers.get('Accept-Encoding', ''))
+        response = Response(body, mimetype='application/json')
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+    
+    # Weak, since the same payload may be sent with different encodings
+    response.set_etag(etag, weak=True)
+    response.headers['Vary'] = 'Accept-Encoding'
+    # Clients may keep the payload but must revalidate it (cheaply, with If-None-Match)
+    response.cache_control.no_cache = True
+    return response
+
+def bulk_payload(outcomes, fields=None, article_fields=None):
+    """JSON-ready payload for analyze_topics_bulk() outcomes"""
+    return {
+        'results': {
+            topic: {'error': str(outcome)} if isinstance(outcome, AnalysisError)
+            else results_payload(outcome, fields, article_fields)
+            for topic, outcome in outcomes.items()
+        }
+    }
+
+@app.route('/api/analyze/bulk', methods=['POST'])
+def api_analyze_bulk():
+    """Analyze a list of topics with shared fetching and scoring"""
+    data = request.get_json(silent=True) or {}
+    topics = data.get('topics') if isinstance(data, dict) else None
+    
+    if not isinstance(topics, list) or not topics or not all(isinstance(t, str) for t in topics):
+        return {'error': 'Please provide a JSON body with a non-empty "topics" list'}, 400
+    
+    if len(topics) > BULK_MAX_TOPICS:
+        return {'error': f'At most {BULK_MAX_TOPICS} topics can be analyzed per request'}, 400
+    
+    if not news_scraper.is_configured():
+        return {'error': 'News API is not configured. Please add your NEWS_API_KEY to environment variables.'}, 503
+    
+    outcomes = analyze_topics_bulk(topics)
+    payload = bulk_payload(
+        outcomes,
+        parse_fields(api_param('fields')),
+        parse_fields(api_param('article_fields'))
+    )
+    body, encoding = compress(encode_json(payload), request.headers.get('Accept-Encoding', ''))
+    response = Response(body, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.cli.command('bulk-analyze')
+@click.argument('topics', nargs=-1)
+@click.option('--file', 'topics_file', type=click.File('r'), help='Read topics from a file, one per line.')
+@click.option('--output', type=click.File('w'), default='-', help='Write JSON results here (default: stdout).')
+@click.option('--article-fields', default=None, help='Comma-separated article fields to include.')
+def bulk_analyze_command(topics, topics_file, output, article_fields):
+    """Analyze many topics in one run and print JSON results."""
+    topics = list(topics)
+    if topics_file is not None:
+        topics.extend(line.strip() for line in topics_file if line.strip())
+    
+    if not topics:
+        raise click.UsageError('Give at least one topic, as arguments or with --file.')
+    
+    if not news_scraper.is_configured():
+        raise click.ClickException('News API is not configured. Please set NEWS_API_KEY.')
+    
+    outcomes = analyze_topics_bulk(topics)
+    json.dump(bulk_payload(outcomes, article_fields=parse_fields(article_fields)), output, indent=2)
+    output.write('\n')
+
+@app.route('/assets/style.css')
+def stylesheet():
+    """Serve the page CSS as a cacheable asset (the page links it with a versioned URL)"""
+    response = Response(CSS, mimetype='text/css')
+    response.set_etag(CSS_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000
+    response.cache_control.immutable = True
+    return response.make_conditional(request)
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text exposition of stage timers, counters and cache stats"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+def preload_sentiment():
+    """
+    Load the sentiment backend now instead of on the first analysis
+    gunicorn.conf.py calls this in the master so forked workers share it copy-on-write
+    """
+    started = time.perf_counter()
+    sentiment_analyzer.preload()
+    startup_stats['sentiment_preload_seconds'] = round(time.perf_counter() - started, 4)
+
 @app.route('/health')
 def health():
     return {
         'status': 'healthy',
-        'news_api_configured': news_scraper.is_configured()
+        'news_api_configured': news_scraper.is_configured(),
+        'news_api_http': news_scraper.http_stats(),
+        'scrape_cache': news_scraper.cache_stats(),
+        'article_store': news_scraper.store.stats() if news_scraper.store is not None else None,
+        'sentiment_cache': sentiment_analyzer.cache_stats(),
+        'sentiment_model': sentiment_analyzer.model_stats(),
+        'single_flight': topic_flight.stats(),
+        'prefetch': prefetch_scheduler.stats() if prefetch_scheduler.top_n > 0 else None,
+        'startup': {
+            **startup_stats,
+            'loaded_before_fork': startup_stats['loaded_pid'] != os.getpid(),
+            'sentiment_backend_loaded': sentiment_analyzer.backend_loaded
+        }
     }
 
+# Startup cost of this process (or of the gunicorn master, when the app is preloaded)
+startup_stats = {
+    'loaded_pid': os.getpid(),
+    'app_load_seconds': round(time.perf_counter() - _load_started, 4),
+    'sentiment_preload_seconds': None
+}
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 10000))
     app.run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,56 @@
+"""
+ASGI entry point for the async pipeline.
+
+POST /analyze is served on the event loop (async fetch, scoring in an executor),
+so one worker overlaps many in-flight topic requests. Every other route goes
+through the regular Flask app. Run with e.g.:
+
+    gunicorn asgi:application -k uvicorn.workers.UvicornWorker
+"""
+from urllib.parse import parse_qs
+from asgiref.wsgi import WsgiToAsgi
+
+from app import app, analyze_page_async
+
+MAX_FORM_BYTES = 64 * 1024
+
+flask_application = WsgiToAsgi(app)
+
+async def read_body(receive):
+    """Read the full request body (up to MAX_FORM_BYTES)"""
+    body = b''
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get('body', b'')
+        more_body = message.get('more_body', False)
+        if len(body) > MAX_FORM_BYTES:
+            raise ValueError('Request body too large')
+    return body
+
+async def send_html(send, status, html):
+    """Send a complete HTML response"""
+    body = html.encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'text/html; charset=utf-8'),
+            (b'content-length', str(len(body)).encode())
+        ]
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+async def application(scope, receive, send):
+    """Route POST /analyze to the async pipeline and everything else to Flask"""
+    if scope['type'] == 'http' and scope['path'] == '/analyze' and scope['method'] == 'POST':
+        try:
+            form = parse_qs((await read_body(receive)).decode('utf-8', 'replace'))
+        except ValueError as e:
+            await send_html(send, 413, str(e))
+            return
+        topic = form.get('topic', [''])[0]
+        await send_html(send, 200, await analyze_page_async(topic))
+        return
+
+    await flask_application(scope, receive, send)
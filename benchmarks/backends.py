@@ -0,0 +1,145 @@
+"""
+Compare sentiment backends for speed and agreement.
+
+Every backend scores the labeled headlines in benchmarks/data (accuracy and
+label agreement with the reference backend) and a synthetic article set
+(throughput, uncached, plus agreement on those articles). With --concurrency,
+the synthetic set is also scored by that many threads sending small requests
+at once, which is where the onnx backend's dynamic batching pays off.
+
+    python -m benchmarks.backends --backends textblob lexicon --size 2000
+    python -m benchmarks.backends --model-dir models/sentiment --threads 4 --concurrency 8
+"""
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.news_scraper import NewsScraper
+from utils.sentiment_analyzer import SentimentAnalyzer
+from benchmarks.fixtures import generate_articles, load_fixture, TOPICS, DEFAULT_SEED
+from benchmarks.report import run_metadata, write_report
+
+LABELED_PATH = os.path.join(os.path.dirname(__file__), 'data', 'labeled_headlines.json')
+
+def create_analyzer(backend, model_options=None):
+    return SentimentAnalyzer(backend=backend, model_options=model_options)
+
+def agreement(labels, reference):
+    return round(sum(a == b for a, b in zip(labels, reference)) / len(reference), 4) if reference else None
+
+def throughput(analyzer, texts, repeat):
+    """Best-of-repeat texts per second for uncached batch scoring"""
+    analyzer.preload()
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        analyzer.analyze_batch(texts, use_cache=False)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return round(len(texts) / best, 1), round(best / len(texts) * 1e6, 2)
+
+def concurrent_throughput(analyzer, texts, concurrency, request_size):
+    """Texts per second when concurrency threads score request_size texts at a time"""
+    requests = [texts[i:i + request_size] for i in range(0, len(texts), request_size)]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        started = time.perf_counter()
+        list(pool.map(lambda request: analyzer.analyze_batch(request, use_cache=False), requests))
+        elapsed = time.perf_counter() - started
+    return round(len(texts) / elapsed, 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare sentiment backends')
+    parser.add_argument('--backends', nargs='+', help='default: textblob and lexicon, plus onnx with --model-dir')
+    parser.add_argument('--reference', default='textblob', help='backend the others are compared with')
+    parser.add_argument('--size', type=int, default=2000, help='synthetic articles for the speed test')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--labeled', default=LABELED_PATH)
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    parser.add_argument('--model-dir', help='exported ONNX model for the onnx backend')
+    parser.add_argument('--threads', type=int, help='ONNX Runtime intra-op threads (default: all cores)')
+    parser.add_argument('--batch-size', type=int, default=32, help='onnx inference batch size')
+    parser.add_argument('--batch-wait-ms', type=float, default=2.0, help='onnx dynamic batching window')
+    parser.add_argument('--concurrency', type=int, default=0, help='also score with this many threads at once')
+    parser.add_argument('--request-size', type=int, default=1, help='texts per request in the concurrent test')
+    args = parser.parse_args()
+
+    model_options = {
+        'model_dir': args.model_dir,
+        'threads': args.threads,
+        'max_batch_size': args.batch_size,
+        'batch_wait_ms': args.batch_wait_ms
+    }
+
+    labeled = load_fixture(args.labeled)
+    labeled_texts = [item['text'] for item in labeled]
+    expected = [item['label'] for item in labeled]
+
+    # Synthetic articles spread over every fixture topic
+    scraper = NewsScraper(api_key=None)
+    per_topic = max(1, args.size // len(TOPICS))
+    texts = [
+        article.text
+        for topic in TOPICS
+        for article in scraper._process_articles(generate_articles(per_topic, topic, args.seed), set())
+    ]
+
+    backends = list(args.backends or [b for b in SentimentAnalyzer.BACKENDS if b != 'onnx' or args.model_dir])
+    if args.reference not in backends:
+        backends.insert(0, args.reference)
+
+    labels = {}
+    results = []
+    for backend in backends:
+        analyzer = create_analyzer(backend, model_options if backend == 'onnx' else None)
+        texts_per_second, us_per_text = throughput(analyzer, texts, args.repeat)
+        concurrent = None
+        if args.concurrency:
+            concurrent = concurrent_throughput(analyzer, texts, args.concurrency, args.request_size)
+        labeled_labels = [r['label'] for r in analyzer.analyze_batch(labeled_texts, use_cache=False)]
+        synthetic_labels = [r['label'] for r in analyzer.analyze_batch(texts, use_cache=False)]
+        labels[backend] = (labeled_labels, synthetic_labels)
+
+        confusion = Counter(f'{want}->{got}' for want, got in zip(expected, labeled_labels))
+        results.append({
+            'backend': backend,
+            'texts_per_second': texts_per_second,
+            'us_per_text': us_per_text,
+            'concurrent_texts_per_second': concurrent,
+            'labeled_accuracy': agreement(labeled_labels, expected),
+            'labeled_confusion': dict(sorted(confusion.items())),
+            'synthetic_distribution': dict(Counter(synthetic_labels)),
+            'model': analyzer.model_stats()
+        })
+
+    reference_labeled, reference_synthetic = labels[args.reference]
+    reference_speed = next(r['texts_per_second'] for r in results if r['backend'] == args.reference)
+    for result in results:
+        labeled_labels, synthetic_labels = labels[result['backend']]
+        result['agreement_labeled'] = agreement(labeled_labels, reference_labeled)
+        result['agreement_synthetic'] = agreement(synthetic_labels, reference_synthetic)
+        result['speedup'] = round(result['texts_per_second'] / reference_speed, 2)
+        print(f"{result['backend']:>10}  {result['texts_per_second']:10.1f} texts/s  x{result['speedup']:<6}"
+              f"  accuracy {result['labeled_accuracy']:.3f}  agreement {result['agreement_labeled']:.3f}"
+              f" labeled / {result['agreement_synthetic']:.3f} synthetic", file=sys.stderr)
+
+    report = {
+        'meta': run_metadata(
+            reference=args.reference,
+            size=len(texts),
+            labeled=len(labeled),
+            repeat=args.repeat,
+            seed=args.seed,
+            concurrency=args.concurrency,
+            request_size=args.request_size,
+            model_options=model_options if 'onnx' in backends else None
+        ),
+        'results': results
+    }
+    write_report(report, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+"""
+Synthetic News API fixtures for benchmarks.
+
+Articles are generated from a seeded random generator, so the same size,
+topic and seed always produce the same responses. Recorded responses can be
+written to disk and loaded back in place of the synthetic ones:
+
+    python -m benchmarks.fixtures --output benchmarks/fixtures
+"""
+import os
+import json
+import random
+import argparse
+from datetime import datetime, timedelta
+
+FIXTURE_SIZES = (100, 1000, 10000)
+DEFAULT_SEED = 1234
+DEFAULT_TOPIC = 'artificial intelligence'
+
+TOPICS = (
+    'artificial intelligence', 'climate change', 'stock market', 'electric vehicles',
+    'world cup', 'elections', 'space exploration', 'inflation', 'cricket', 'startups'
+)
+
+# Mix of exact, partial and unknown source names, like real News API results
+SOURCES = (
+    'BBC News', 'Reuters', 'The Associated Press', 'CNN', 'The Guardian', 'Bloomberg',
+    'The Times of India', 'Hindustan Times', 'NDTV', 'TechCrunch', 'The Verge', 'Wired',
+    'Forbes', 'CNBC', 'ESPN', 'Variety', 'Yahoo Entertainment', 'Gizmodo.com', 'Biztoc.com',
+    'Slashdot.org', 'Forbes India', 'Times Now', 'Random Blog', 'Daily Herald'
+)
+
+POSITIVE_PHRASES = (
+    'reports record growth', 'celebrates a major breakthrough', 'posts strong gains',
+    'wins praise from experts', 'surges after a successful launch', 'shows remarkable improvement',
+    'boosts confidence across the sector', 'delivers an excellent quarter'
+)
+NEGATIVE_PHRASES = (
+    'faces a deepening crisis', 'suffers a sharp decline', 'is hit by a major lawsuit',
+    'announces layoffs amid concerns', 'warns of serious risks', 'plunges after the scandal',
+    'struggles with mounting losses', 'fails to meet expectations'
+)
+NEUTRAL_PHRASES = (
+    'announces plans for next year', 'releases its quarterly report', 'schedules a review',
+    'publishes new data', 'updates its guidance', 'holds an annual meeting'
+)
+FILLER = (
+    'Analysts are watching the developments closely.',
+    'The company did not respond to a request for comment.',
+    'Officials said more details would follow later this week.',
+    'Markets reacted within hours of the announcement.',
+    'The report cites figures from several independent studies.',
+    'Industry groups expect further changes in the coming months.'
+)
+
+BASE_TIME = datetime(2026, 1, 15, 12, 0, 0)
+
+def generate_articles(count, topic=DEFAULT_TOPIC, seed=DEFAULT_SEED):
+    """
+    Generate raw News API article dicts for a topic
+    Most articles mention the topic; a few are irrelevant, duplicated, too short or empty
+    """
+    rng = random.Random(f'{seed}|{topic}|{count}')
+    subject = topic.title()
+    articles = []
+
+    for i in range(count):
+        tone = rng.random()
+        if tone < 0.35:
+            phrase = rng.choice(POSITIVE_PHRASES)
+        elif tone < 0.7:
+            phrase = rng.choice(NEGATIVE_PHRASES)
+        else:
+            phrase = rng.choice(NEUTRAL_PHRASES)
+
+        kind = rng.random()
+        mentioned = subject if kind >= 0.06 else rng.choice(TOPICS).title()
+        title = f'{mentioned} {phrase}'
+        description = f'{mentioned} {rng.choice(NEUTRAL_PHRASES)}. ' + ' '.join(rng.sample(FILLER, 2))
+        content = description + f' [+{rng.randint(200, 4000)} chars]'
+        url = f'https://news.example.com/{topic.replace(" ", "-")}/{seed}/{i}'
+
+        if 0.06 <= kind < 0.09:
+            # Content only, as for some sources
+            description = None
+        elif 0.09 <= kind < 0.11:
+            # Too short to analyze
+            title, description, content = mentioned, None, None
+        elif 0.11 <= kind < 0.12:
+            # Nothing usable at all
+            title, description = None, None
+        elif 0.12 <= kind < 0.14 and i > 0:
+            # Same story returned twice
+            url = f'https://news.example.com/{topic.replace(" ", "-")}/{seed}/{i - 1}'
+
+        published = BASE_TIME - timedelta(minutes=i * 7 + rng.randint(0, 6))
+        articles.append({
+            'source': {'id': None, 'name': rng.choice(SOURCES)},
+            'author': None,
+            'title': title,
+            'description': description,
+            'url': url,
+            'urlToImage': None,
+            'publishedAt': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'content': content
+        })
+
+    return articles
+
+def newsapi_response(articles, page=1, page_size=100):
+    """Build one page of a News API /v2/everything response"""
+    start = (page - 1) * page_size
+    return {
+        'status': 'ok',
+        'totalResults': len(articles),
+        'articles': articles[start:start + page_size]
+    }
+
+def fixture_path(directory, size):
+    return os.path.join(directory, f'newsapi_{size}.json')
+
+def write_fixtures(directory, sizes=FIXTURE_SIZES, topic=DEFAULT_TOPIC, seed=DEFAULT_SEED):
+    """Write one full response per size; returns the written paths"""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for size in sizes:
+        path = fixture_path(directory, size)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(newsapi_response(generate_articles(size, topic, seed), page_size=size), f)
+        paths.append(path)
+    return paths
+
+def load_fixture(path):
+    """Load the articles of a recorded (or written) News API response"""
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return data['articles'] if isinstance(data, dict) else data
+
+def main():
+    parser = argparse.ArgumentParser(description='Write synthetic News API fixtures')
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(__file__), 'fixtures'))
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(FIXTURE_SIZES))
+    parser.add_argument('--topic', default=DEFAULT_TOPIC)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    for path in write_fixtures(args.output, args.sizes, args.topic, args.seed):
+        print(path)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,322 @@
+"""
+Load test of the app under gunicorn against the local News API stub.
+
+For every gunicorn configuration (workers x threads) and client concurrency,
+this starts the stub server and `gunicorn app:app`, drives /analyze with a
+Zipf-distributed topic mix (popular topics repeat, as with real traffic),
+and reports throughput, p50/p95/p99 latency and per-worker CPU and RSS read
+from /proc. Linux only.
+
+    python -m benchmarks.loadtest --configs 1x1 2x1 2x4 --concurrency 4 16 \\
+        --duration 30 --latency 0.15 --output loadtest.json
+
+Extra app settings are passed with --env, e.g. --env SCORING_MODE=process.
+"""
+import os
+import sys
+import math
+import time
+import random
+import socket
+import argparse
+import threading
+import subprocess
+
+import requests
+
+from benchmarks.fixtures import TOPICS, DEFAULT_SEED
+from benchmarks.report import run_metadata, write_report
+
+# Topic vocabulary; earlier entries are requested more often
+TOPIC_MIX = TOPICS + (
+    'bitcoin', 'olympics', 'interest rates', 'renewable energy', 'semiconductors',
+    'housing market', 'monsoon', 'vaccines', 'streaming services', 'cybersecurity',
+    'premier league', 'oil prices', 'supreme court', 'tourism', 'smartphones',
+    'quantum computing', 'wildfires', 'trade policy', 'video games', 'mars mission',
+    'public transport', 'education reform', 'film festival', 'agriculture', 'robotics',
+    'social media', 'healthcare costs', 'airlines', 'tennis', 'fashion week'
+)
+
+CLOCK_TICKS = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def zipf_weights(count, exponent):
+    return [1.0 / (rank ** exponent) for rank in range(1, count + 1)]
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    index = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+def child_pids(parent_pid):
+    """PIDs of the direct children of a process"""
+    children = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # The command name may contain spaces; fields resume after the last ')'
+        fields = stat[stat.rfind(')') + 2:].split()
+        if int(fields[1]) == parent_pid:
+            children.append(int(entry))
+    return children
+
+def process_sample(pid):
+    """Return (cpu seconds, rss MB, peak rss MB) of a process, or None if it is gone"""
+    try:
+        with open(f'/proc/{pid}/stat') as f:
+            stat = f.read()
+        with open(f'/proc/{pid}/status') as f:
+            status = f.read()
+    except OSError:
+        return None
+    fields = stat[stat.rfind(')') + 2:].split()
+    cpu = (int(fields[11]) + int(fields[12])) / CLOCK_TICKS
+    memory = {}
+    for line in status.splitlines():
+        if line.startswith(('VmRSS:', 'VmHWM:')):
+            name, value = line.split(':', 1)
+            memory[name] = int(value.split()[0]) / 1024
+    return cpu, memory.get('VmRSS', 0.0), memory.get('VmHWM', 0.0)
+
+class Server:
+    """A gunicorn app:app process with a given worker/thread configuration"""
+
+    def __init__(self, workers, threads, env, gunicorn_args=()):
+        self.workers = workers
+        self.threads = threads
+        self.port = free_port()
+        self.url = f'http://127.0.0.1:{self.port}'
+        command = [
+            sys.executable, '-m', 'gunicorn', 'app:app',
+            '--bind', f'127.0.0.1:{self.port}',
+            '--workers', str(workers),
+            '--threads', str(threads),
+            '--timeout', '120',
+            '--log-level', 'warning',
+            *gunicorn_args
+        ]
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.process = subprocess.Popen(command, cwd=root, env=env)
+
+    def wait_ready(self, timeout=60):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise Exception(f'gunicorn exited with status {self.process.returncode}')
+            try:
+                if requests.get(self.url + '/health', timeout=2).status_code == 200:
+                    # Every worker must be up before measuring
+                    if len(child_pids(self.process.pid)) >= self.workers:
+                        return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise Exception('gunicorn did not become ready in time')
+
+    def worker_samples(self):
+        samples = {}
+        for pid in child_pids(self.process.pid):
+            sample = process_sample(pid)
+            if sample is not None:
+                samples[pid] = sample
+        return samples
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+# /analyze answers 200 for failures too, with the message in an error block
+ERROR_MARKER = b'<div class="error">'
+
+def succeeded(endpoint, response):
+    """Whether a response carries analysis results (not an error page or error status)"""
+    if endpoint == 'api':
+        return 200 <= response.status_code < 300 or response.status_code == 304
+    return response.status_code == 200 and ERROR_MARKER not in response.content
+
+def drive(url, endpoint, topics, weights, concurrency, duration, seed):
+    """
+    Closed-loop load: `concurrency` clients send requests back to back
+    Returns (latencies of successful requests, error count, elapsed seconds)
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(index):
+        rng = random.Random(f'{seed}|{index}')
+        session = requests.Session()
+        local = []
+        failed = 0
+        while time.monotonic() < deadline:
+            topic = rng.choices(topics, weights)[0]
+            start = time.perf_counter()
+            try:
+                if endpoint == 'api':
+                    response = session.get(url + '/api/analyze', params={'topic': topic}, timeout=120)
+                else:
+                    response = session.post(url + '/analyze', data={'topic': topic}, timeout=120)
+                ok = succeeded(endpoint, response)
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            if ok:
+                local.append(elapsed)
+            else:
+                failed += 1
+        session.close()
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    started = time.monotonic()
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors[0], time.monotonic() - started
+
+def run_config(workers, threads, concurrency, args, env, topics, weights):
+    """Start gunicorn with one configuration, warm it up and measure one load level"""
+    server = Server(workers, threads, env, args.gunicorn_arg)
+    try:
+        server.wait_ready()
+        if args.warmup > 0:
+            drive(server.url, args.endpoint, topics, weights, concurrency, args.warmup, args.seed + 1)
+
+        before = server.worker_samples()
+        latencies, errors, elapsed = drive(
+            server.url, args.endpoint, topics, weights, concurrency, args.duration, args.seed
+        )
+        after = server.worker_samples()
+    finally:
+        server.stop()
+
+    per_worker = []
+    for pid, (cpu_after, rss, peak_rss) in sorted(after.items()):
+        cpu_before = before.get(pid, (cpu_after, 0, 0))[0]
+        per_worker.append({
+            'pid': pid,
+            'cpu_percent': round((cpu_after - cpu_before) / elapsed * 100, 1),
+            'rss_mb': round(rss, 1),
+            'peak_rss_mb': round(peak_rss, 1)
+        })
+
+    latencies.sort()
+    completed = len(latencies)
+    return {
+        'workers': workers,
+        'threads': threads,
+        'concurrency': concurrency,
+        'duration_s': round(elapsed, 3),
+        'requests': completed,
+        'errors': errors,
+        'throughput_rps': round(completed / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            name: round(value * 1000, 2) if value is not None else None
+            for name, value in (
+                ('p50', percentile(latencies, 0.50)),
+                ('p95', percentile(latencies, 0.95)),
+                ('p99', percentile(latencies, 0.99)),
+                ('max', latencies[-1] if latencies else None)
+            )
+        },
+        'workers_cpu_rss': per_worker
+    }
+
+def parse_config(value):
+    """Parse a WORKERSxTHREADS configuration such as 2x4"""
+    workers, _, threads = value.lower().partition('x')
+    return int(workers), int(threads or 1)
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the app under gunicorn')
+    parser.add_argument('--configs', nargs='+', default=['1x1', '2x1', '2x4'],
+                        help='gunicorn WORKERSxTHREADS configurations')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[4, 16],
+                        help='concurrent clients (one run per value)')
+    parser.add_argument('--duration', type=float, default=20, help='measured seconds per run')
+    parser.add_argument('--warmup', type=float, default=3, help='unmeasured seconds per run')
+    parser.add_argument('--endpoint', choices=('analyze', 'api'), default='analyze')
+    parser.add_argument('--topics', type=int, default=len(TOPIC_MIX), help='distinct topics in the mix')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Zipf exponent of topic popularity')
+    parser.add_argument('--latency', type=float, default=0.15, help='stub News API latency in seconds')
+    parser.add_argument('--jitter', type=float, default=0.05, help='stub latency jitter in seconds')
+    parser.add_argument('--articles', type=int, default=100, help='stub articles per topic')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE',
+                        help='extra environment for the app')
+    parser.add_argument('--gunicorn-arg', action='append', default=[],
+                        help='extra argument passed to gunicorn')
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    args = parser.parse_args()
+
+    topics = list(TOPIC_MIX[:args.topics])
+    weights = zipf_weights(len(topics), args.zipf)
+
+    stub_port = free_port()
+    stub = subprocess.Popen([
+        sys.executable, '-m', 'benchmarks.stub_server',
+        '--port', str(stub_port), '--size', str(args.articles), '--seed', str(args.seed),
+        '--latency', str(args.latency), '--jitter', str(args.jitter)
+    ], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), stdout=subprocess.DEVNULL)
+
+    env = dict(os.environ)
+    env.update({
+        'NEWS_API_KEY': 'loadtest',
+        'NEWS_API_URL': f'http://127.0.0.1:{stub_port}/v2/everything',
+        'ARTICLE_LIMIT': str(args.articles)
+    })
+    for item in args.env:
+        key, _, value = item.partition('=')
+        env[key] = value
+
+    runs = []
+    try:
+        for config in args.configs:
+            workers, threads = parse_config(config)
+            for concurrency in args.concurrency:
+                result = run_config(workers, threads, concurrency, args, env, topics, weights)
+                runs.append(result)
+                latency = result['latency_ms']
+                cpu = ' '.join(f"{w['cpu_percent']:.0f}%/{w['rss_mb']:.0f}MB" for w in result['workers_cpu_rss'])
+                print(f"{workers}x{threads} c={concurrency:<3} {result['throughput_rps']:8.2f} req/s  "
+                      f"p50 {latency['p50']} ms  p95 {latency['p95']} ms  p99 {latency['p99']} ms  "
+                      f"errors {result['errors']}  workers {cpu}", file=sys.stderr)
+    finally:
+        stub.terminate()
+        stub.wait()
+
+    report = {
+        'meta': run_metadata(
+            endpoint=args.endpoint,
+            topics=len(topics),
+            zipf=args.zipf,
+            stub_latency_s=args.latency,
+            stub_jitter_s=args.jitter,
+            articles=args.articles,
+            env=args.env
+        ),
+        'runs': runs
+    }
+    write_report(report, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+import os
+import json
+import platform
+import subprocess
+from datetime import datetime
+
+def git_commit():
+    """Short hash of the checked-out commit (None outside a git checkout)"""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return None
+
+def run_metadata(**extra):
+    """Commit and machine details recorded with every result file"""
+    meta = {
+        'commit': git_commit(),
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+    meta.update(extra)
+    return meta
+
+def write_report(report, output=None):
+    """Write a report as JSON to output, or to stdout"""
+    body = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(body + '\n')
+    else:
+        print(body)
@@ -0,0 +1,162 @@
+"""
+Benchmarks for the analysis pipeline stages and the full pipeline.
+
+Each stage is timed separately on the same fixture, and end_to_end runs
+scrape -> filter -> score -> summarize -> render against the local stub
+server. Results are written as JSON so runs can be compared across commits:
+
+    python -m benchmarks.run --output before.json
+    python -m benchmarks.run --output after.json --compare before.json
+
+No News API key is needed; nothing leaves the machine.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+# app.py reads its configuration at import time: keep benchmarks self-contained
+os.environ.setdefault('NEWS_API_KEY', 'benchmark')
+os.environ.setdefault('PREFETCH_TOP_N', '0')
+
+import app
+from utils.news_scraper import NewsScraper
+from utils.sentiment_analyzer import SentimentAnalyzer
+from utils.html_generator import generate_html_page
+from benchmarks.fixtures import generate_articles, load_fixture, FIXTURE_SIZES, DEFAULT_SEED, DEFAULT_TOPIC
+from benchmarks.stub_server import StubNewsAPI
+from benchmarks.report import run_metadata, write_report
+
+STAGES = ('process', 'scrape', 'filter', 'score', 'summarize', 'render', 'end_to_end')
+
+def time_call(fn, repeat, warmup=1):
+    """Run fn warmup + repeat times; returns the timed durations in seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def summarize_samples(stage, size, articles, samples):
+    median = statistics.median(samples)
+    return {
+        'stage': stage,
+        'size': size,
+        'articles': articles,
+        'repeat': len(samples),
+        'min_s': round(min(samples), 6),
+        'median_s': round(median, 6),
+        'mean_s': round(statistics.fmean(samples), 6),
+        'stdev_s': round(statistics.stdev(samples), 6) if len(samples) > 1 else 0.0,
+        'per_article_us': round(median / articles * 1e6, 3) if articles else None
+    }
+
+def run_size(size, raw_articles, stub, topic, repeat, stages, backend='textblob'):
+    """Benchmark every selected stage on one fixture size"""
+    results = []
+    scraper = NewsScraper(api_key='benchmark', base_url=stub.url)
+    analyzer = SentimentAnalyzer(backend=backend)
+
+    # Inputs for the isolated stages are computed once, outside the timings
+    articles = list(scraper._process_articles(raw_articles, set()))
+    selected = app.select_articles(topic, articles)
+    texts = [a.text for a in selected]
+    for article, sentiment in zip(selected, analyzer.analyze_batch(texts)):
+        article.sentiment = sentiment['label']
+        article.confidence = sentiment['score']
+    summary = app.summarize_results(topic, articles, selected)
+
+    def end_to_end():
+        fetched = scraper.scrape(topic, limit=size)
+        analyzed = app.select_articles(topic, fetched)
+        for article, sentiment in zip(analyzed, analyzer.analyze_batch([a.text for a in analyzed])):
+            article.sentiment = sentiment['label']
+            article.confidence = sentiment['score']
+        results = app.summarize_results(topic, fetched, analyzed)
+        return generate_html_page(True, results, None, topic)
+
+    benchmarks = {
+        'process': (lambda: list(scraper._process_articles(raw_articles, set())), len(raw_articles)),
+        'scrape': (lambda: scraper.scrape(topic, limit=size), len(raw_articles)),
+        'filter': (lambda: app.select_articles(topic, articles), len(articles)),
+        'score': (lambda: [analyzer.analyze(text) for text in texts], len(texts)),
+        'summarize': (lambda: app.summarize_results(topic, articles, selected), len(selected)),
+        'render': (lambda: generate_html_page(True, summary, None, topic), len(summary['articles'])),
+        'end_to_end': (end_to_end, len(raw_articles))
+    }
+
+    for stage in stages:
+        fn, count = benchmarks[stage]
+        # Scoring dominates; fewer repeats keep large sizes practical
+        stage_repeat = max(1, repeat // 2) if stage in ('score', 'end_to_end') and size >= 10000 else repeat
+        result = summarize_samples(stage, size, count, time_call(fn, stage_repeat))
+        results.append(result)
+        print(f"{stage:>11} n={size:<6} median {result['median_s'] * 1000:10.2f} ms"
+              f"  ({result['per_article_us'] or 0:9.2f} us/article)", file=sys.stderr)
+
+    return results
+
+def compare(results, baseline_path):
+    """Print median ratios against a previous results file"""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['stage'], r['size']): r for r in baseline['results']}
+
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('commit')}):", file=sys.stderr)
+    for result in results:
+        before = previous.get((result['stage'], result['size']))
+        if before is None or not before['median_s']:
+            continue
+        ratio = result['median_s'] / before['median_s']
+        print(f"{result['stage']:>11} n={result['size']:<6} {before['median_s'] * 1000:10.2f} ms -> "
+              f"{result['median_s'] * 1000:10.2f} ms  x{ratio:.2f}", file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the analysis pipeline')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(FIXTURE_SIZES))
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--backend', choices=SentimentAnalyzer.BACKENDS, default='textblob',
+                        help='sentiment backend for the score and end_to_end stages')
+    parser.add_argument('--topic', default=DEFAULT_TOPIC)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--fixture', help='recorded News API response to use instead of synthetic articles')
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    parser.add_argument('--compare', help='previous results file to compare against')
+    args = parser.parse_args()
+
+    recorded = load_fixture(args.fixture) if args.fixture else None
+    sizes = [len(recorded)] if recorded is not None else args.sizes
+
+    results = []
+    for size in sizes:
+        raw_articles = recorded if recorded is not None else generate_articles(size, args.topic, args.seed)
+        stub = StubNewsAPI(articles=raw_articles)
+        stub.start()
+        try:
+            results.extend(run_size(size, raw_articles, stub, args.topic, args.repeat, args.stages, args.backend))
+        finally:
+            stub.stop()
+
+    report = {
+        'meta': run_metadata(
+            topic=args.topic,
+            seed=args.seed,
+            fixture=args.fixture,
+            repeat=args.repeat,
+            backend=args.backend
+        ),
+        'results': results
+    }
+    write_report(report, args.output)
+
+    if args.compare:
+        compare(results, args.compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Startup cost of the app in fresh interpreters.
+
+Measures how long `import app` takes, how long the first sentiment score
+takes afterwards (the lazy TextBlob load) and the resulting RSS, each in a
+new process, which is what a gunicorn worker pays on boot without preloading.
+
+    python -m benchmarks.startup --repeat 5 --output startup.json
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+from benchmarks.report import run_metadata, write_report
+
+PROBE = '''
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+textblob_at_import = 'textblob' in sys.modules
+app.sentiment_analyzer.analyze('Startup probe: markets rally on strong growth')
+scored = time.perf_counter()
+print(json.dumps({
+    'import_s': imported - started,
+    'first_score_s': scored - imported,
+    'textblob_at_import': textblob_at_import,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+}))
+'''
+
+def measure(repeat):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, NEWS_API_KEY=os.environ.get('NEWS_API_KEY', 'benchmark'))
+    samples = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE], cwd=root, env=env,
+            capture_output=True, text=True, check=True
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure app import and first-score time')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write JSON results here (default: stdout)')
+    args = parser.parse_args()
+
+    samples = measure(args.repeat)
+    summary = {
+        name: round(statistics.median(sample[name] for sample in samples), 4)
+        for name in ('import_s', 'first_score_s', 'max_rss_mb')
+    }
+    print(f"import app {summary['import_s'] * 1000:.1f} ms, first score {summary['first_score_s'] * 1000:.1f} ms, "
+          f"max RSS {summary['max_rss_mb']:.1f} MB (median of {args.repeat})", file=sys.stderr)
+
+    write_report({'meta': run_metadata(repeat=args.repeat), 'median': summary, 'samples': samples}, args.output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,146 @@
+"""
+Local stand-in for the News API /v2/everything endpoint.
+
+Every query gets a deterministic synthetic result set (see fixtures.py), or
+a fixed article list when one is given. Latency can be added per request to
+model the real API. Run standalone for load tests:
+
+    python -m benchmarks.stub_server --port 8001 --size 300 --latency 0.15
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from benchmarks.fixtures import generate_articles, newsapi_response, DEFAULT_SEED
+
+class StubNewsAPI:
+    """
+    Threaded HTTP server answering News API queries from fixtures.
+
+    articles: list of raw article dicts returned for every query, or None to
+    generate `size` articles per topic. latency and jitter are in seconds;
+    each response waits latency plus a uniform random share of jitter.
+    """
+
+    def __init__(self, articles=None, size=100, seed=DEFAULT_SEED, latency=0.0, jitter=0.0,
+                 host='127.0.0.1', port=0):
+        self.articles = articles
+        self.size = size
+        self.seed = seed
+        self.latency = latency
+        self.jitter = jitter
+        self.host = host
+        self.port = port
+        self.requests = 0
+
+        self._topics = {}
+        self._pages = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        return f'http://{self.host}:{self.port}/v2/everything'
+
+    def articles_for(self, topic):
+        """Return the article list served for a topic"""
+        if self.articles is not None:
+            return self.articles
+        key = topic.lower().strip()
+        with self._lock:
+            articles = self._topics.get(key)
+            if articles is None:
+                articles = self._topics[key] = generate_articles(self.size, key, self.seed)
+        return articles
+
+    def page_body(self, topic, page, page_size):
+        """Encoded response body for one page (cached, so the stub costs little CPU)"""
+        key = (topic.lower().strip(), page, page_size)
+        body = self._pages.get(key)
+        if body is None:
+            data = newsapi_response(self.articles_for(topic), page, page_size)
+            body = json.dumps(data).encode('utf-8')
+            with self._lock:
+                self._pages[key] = body
+        return body
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately; don't let Nagle delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                query = parse_qs(urlparse(self.path).query)
+                topic = query.get('q', [''])[0]
+                page = int(query.get('page', ['1'])[0])
+                page_size = min(int(query.get('pageSize', ['100'])[0]), 100)
+                stub.requests += 1
+
+                delay = stub.latency + (random.uniform(0, stub.jitter) if stub.jitter else 0)
+                if delay > 0:
+                    time.sleep(delay)
+
+                body = stub.page_body(topic, page, page_size)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _bind(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), self._handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+
+    def start(self):
+        """Serve in a background thread; returns the endpoint URL"""
+        self._bind()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def serve_forever(self):
+        """Serve in the current thread until interrupted"""
+        self._bind()
+        print(f'Stub News API listening on {self.url}', flush=True)
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve synthetic News API responses')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8001)
+    parser.add_argument('--size', type=int, default=100, help='articles per topic')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random seconds, up to this much')
+    args = parser.parse_args()
+
+    StubNewsAPI(size=args.size, seed=args.seed, latency=args.latency, jitter=args.jitter,
+                host=args.host, port=args.port).serve_forever()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# gunicorn settings, picked up automatically by `gunicorn app:app`
+# Bind address and worker count keep gunicorn's defaults ($PORT and $WEB_CONCURRENCY)
+import gc
+import os
+
+# Import the app once in the master and fork workers from it, so each worker
+# boots without re-importing Flask, the utils and the sentiment backend
+preload_app = os.environ.get('GUNICORN_PRELOAD', 'true').lower() in ('1', 'true', 'yes')
+
+# Also load TextBlob and its lexicon in the master (only when preloading the app);
+# the onnx backend's model is loaded in each worker after the fork instead
+preload_sentiment = os.environ.get('PRELOAD_SENTIMENT', 'true').lower() in ('1', 'true', 'yes')
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before workers are forked"""
+    if not preload_app:
+        return
+
+    import app
+    if preload_sentiment and app.sentiment_analyzer.backend != 'onnx':
+        app.preload_sentiment()
+        server.log.info(f"Sentiment backend preloaded in {app.startup_stats['sentiment_preload_seconds']}s")
+
+    # Move everything loaded so far out of the garbage collector's reach, so
+    # collections in the workers do not touch (and copy) the shared pages
+    gc.freeze()
+
+def post_fork(server, worker):
+    """Runs in each worker right after it is forked from the master"""
+    import app
+
+    # ONNX Runtime sessions do not survive a fork, so each worker creates its own
+    if preload_app and preload_sentiment and app.sentiment_analyzer.backend == 'onnx':
+        app.preload_sentiment()
+
+    # Each worker has its own scoring pool: unless SCORING_WORKERS is set, split
+    # the cores between the workers instead of giving every pool all of them
+    if not int(os.environ.get('SCORING_WORKERS', 0)):
+        from utils.parallel_scoring import default_workers
+        app.sentiment_scorer.workers = default_workers(server.cfg.workers)
+
+    # With SCORING_MODE=process, start this worker's scoring pool (and its warm
+    # analyzers) now rather than on the first request; a no-op in serial mode
+    app.sentiment_scorer.warm_up()
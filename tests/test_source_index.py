@@ -0,0 +1,71 @@
+import random
+
+import pytest
+
+from utils.source_index import SourceIndex
+
+NAMES = [
+    'BBC News', 'Reuters', 'The Associated Press', 'Associated Press', 'AP News',
+    'The New York Times', 'CNN', 'TIME', 'The Times of India', 'Scroll.in',
+    'News18', 'Ars Technica', 'The Verge', 'Mint', 'ThePrint', 'PBS'
+]
+
+def linear_scan(names, source_name):
+    """The matching rule as it was written before SourceIndex"""
+    if not source_name:
+        return False
+    source_lower = source_name.lower().strip()
+    for credible in names:
+        credible_lower = credible.lower()
+        if credible_lower == source_lower:
+            return True
+        if credible_lower in source_lower or source_lower in credible_lower:
+            return True
+    return False
+
+@pytest.fixture
+def index():
+    return SourceIndex(NAMES)
+
+@pytest.mark.parametrize('source', [
+    # Exact names, in any case and with surrounding whitespace
+    'BBC News', 'bbc news', '  Reuters ', 'TIME', 'time',
+    # Sources containing a known name
+    'BBC News (UK)', 'Reuters.com', 'The Hindustan Times', 'Mintpress', 'CNN International',
+    # Sources contained in a known name
+    'Associated', 'york', 'the', 'e', 'of india', 'scroll.',
+    # Whitespace-only and empty names
+    '', ' ', '\t\n ',
+    # Names containing newlines
+    'BBC\nNews', 'news\n', 'The\nVerge', 'a\nb', 'reuters\ncnn',
+    # Neither
+    'Random Blog', 'Some Site', 'xyz', 'Medium.com', 'wordpress'
+])
+def test_matches_linear_scan(index, source):
+    assert index.is_credible(source) == linear_scan(NAMES, source)
+
+def test_memoized_verdicts_match(index):
+    for source in ('BBC News', 'Random Blog', 'BBC News', 'Random Blog'):
+        assert index.is_credible(source) == linear_scan(NAMES, source)
+
+def test_none_and_empty_index():
+    assert SourceIndex(NAMES).is_credible(None) is False
+    assert SourceIndex([]).is_credible('BBC News') is False
+
+def test_random_inputs(index):
+    rng = random.Random(1234)
+    alphabet = 'abcdeinorstw .\n'
+    for _ in range(5000):
+        if rng.random() < 0.5:
+            # Slices of known names, padded with random characters
+            name = rng.choice(NAMES)
+            start = rng.randrange(len(name))
+            end = rng.randrange(start, len(name) + 1)
+            source = (''.join(rng.choice(alphabet) for _ in range(rng.randrange(3)))
+                      + name[start:end]
+                      + ''.join(rng.choice(alphabet) for _ in range(rng.randrange(3))))
+        else:
+            source = ''.join(rng.choice(alphabet) for _ in range(rng.randrange(8)))
+        if rng.random() < 0.3:
+            source = source.upper()
+        assert index.is_credible(source) == linear_scan(NAMES, source), repr(source)
@@ -0,0 +1,92 @@
+import heapq
+from array import array
+from collections import Counter
+
+LABELS = ('positive', 'negative', 'neutral')
+LABEL_CODES = {label: code for code, label in enumerate(LABELS)}
+
+class SentimentAggregate:
+    """
+    Compact running aggregate of scored articles.
+
+    Labels, confidences and source ids are kept in typed arrays, so counts,
+    percentages, top-k extremes and source distributions are computed in bulk.
+    Top-k selections use heapq.nlargest (a partial selection that keeps the
+    original order for ties, exactly like a stable full sort).
+    """
+
+    def __init__(self):
+        self.labels = array('b')
+        self.confidences = array('d')
+        self.source_ids = array('I')
+        self.source_names = []
+        self.articles = []
+        self._source_ids = {}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def _source_id(self, source):
+        """Return the id of a source name, assigning ids to new names"""
+        source_id = self._source_ids.get(source)
+        if source_id is None:
+            source_id = len(self.source_names)
+            self.source_names.append(source)
+            self._source_ids[source] = source_id
+        return source_id
+
+    def add(self, article):
+        """Add one scored Article (with sentiment and confidence set)"""
+        self.labels.append(LABEL_CODES.get(article.sentiment, 2))
+        self.confidences.append(article.confidence)
+        self.source_ids.append(self._source_id(article.source))
+        self.articles.append(article)
+
+    def extend(self, articles):
+        """Add several scored articles"""
+        for article in articles:
+            self.add(article)
+
+    def counts(self):
+        """Return a dict of article counts per label"""
+        return {label: self.labels.count(code) for code, label in enumerate(LABELS)}
+
+    def percentages(self):
+        """Return a dict of label percentages rounded to 2 decimals"""
+        total = len(self.labels)
+        return {
+            label: round((count / total * 100) if total > 0 else 0, 2)
+            for label, count in self.counts().items()
+        }
+
+    def top_articles(self, label, k=5):
+        """Return the k most confident articles with the given label"""
+        code = LABEL_CODES[label]
+        labels = self.labels
+        indices = [i for i in range(len(labels)) if labels[i] == code]
+        top = heapq.nlargest(k, indices, key=self.confidences.__getitem__)
+        return [self.articles[i] for i in top]
+
+    def top_sources(self, n=10):
+        """Return the n most frequent sources as (name, count) pairs"""
+        # Counter keeps first-seen order, so ties are ordered like a stable sort
+        counts = Counter(self.source_ids)
+        return [(self.source_names[source_id], count) for source_id, count in counts.most_common(n)]
+
+    def summary(self, top_k=5, top_n_sources=10):
+        """Return the aggregate fields of the results dict"""
+        counts = self.counts()
+        percentages = self.percentages()
+        return {
+            'positive_count': counts['positive'],
+            'negative_count': counts['negative'],
+            'neutral_count': counts['neutral'],
+            'positive_percentage': percentages['positive'],
+            'negative_percentage': percentages['negative'],
+            'neutral_percentage': percentages['neutral'],
+            'extreme_examples': {
+                'most_positive': self.top_articles('positive', top_k),
+                'most_negative': self.top_articles('negative', top_k)
+            },
+            'top_sources': self.top_sources(top_n_sources)
+        }
@@ -0,0 +1,86 @@
+import sys
+import hashlib
+
+class Article:
+    """
+    Compact article record used from the scraper through to the HTML output.
+
+    Slots keep per-article memory low and repeated source names are interned.
+    Dict-style access (article['text'], article.get('source')) is supported
+    for code written against the old article dicts.
+    """
+
+    __slots__ = ('text', 'title', 'description', 'source', 'url', 'published_at',
+                 'sentiment', 'confidence')
+    FIELDS = __slots__
+
+    def __init__(self, text, title='', description='', source='Unknown', url='',
+                 published_at='', sentiment=None, confidence=None):
+        self.text = text
+        self.title = title
+        self.description = description
+        self.source = sys.intern(source) if type(source) is str else source
+        self.url = url
+        self.published_at = published_at
+        self.sentiment = sentiment
+        self.confidence = confidence
+
+    def __getitem__(self, key):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def __contains__(self, key):
+        return key in self.FIELDS
+
+    def get(self, key, default=None):
+        """Dict-style get for a field"""
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def to_tuple(self):
+        """Return the fields as a tuple, in FIELDS order"""
+        return (self.text, self.title, self.description, self.source, self.url,
+                self.published_at, self.sentiment, self.confidence)
+
+    @classmethod
+    def from_tuple(cls, values):
+        """Build an article from to_tuple() output"""
+        return cls(*values)
+
+    def to_dict(self):
+        """Return the fields as a plain dict (for JSON output)"""
+        return dict(zip(self.FIELDS, self.to_tuple()))
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an article from a dict with the same keys"""
+        return cls(**{key: data[key] for key in cls.FIELDS if key in data})
+
+    def dedupe_key(self):
+        """Deduplication key: the URL, or a hash of the text for articles without one"""
+        if self.url:
+            return self.url
+        return 'text:' + hashlib.sha1((self.text or '').encode('utf-8')).hexdigest()
+
+    def copy(self):
+        """Return a shallow copy"""
+        return Article(*self.to_tuple())
+
+    def __reduce__(self):
+        # Pickle as a plain tuple of field values
+        return (Article, self.to_tuple())
+
+    def __eq__(self, other):
+        if not isinstance(other, Article):
+            return NotImplemented
+        return self.to_tuple() == other.to_tuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f'Article(title={self.title!r}, source={self.source!r}, url={self.url!r})'
@@ -0,0 +1,81 @@
+class ArticleFilter:
+    """
+    Quality, relevance and credibility filter for one topic.
+
+    Topic keywords are prepared once, each article is lowercased once, and all
+    three verdicts come out of a single pass. The relevant-only list needed for
+    the fallback (too few credible articles) is collected in the same pass.
+    """
+
+    def __init__(self, topic, source_index, min_credible=5):
+        self.topic_lower = topic.lower()
+        # Topic keywords
+        self.keywords = tuple(word for word in set(self.topic_lower.split()) if len(word) > 2)
+        self.source_index = source_index
+        self.min_credible = min_credible
+
+    @staticmethod
+    def is_quality(text):
+        """Validate that article text has meaningful content"""
+        # Minimum length check
+        if len(text) < 30:
+            return False
+
+        # Must have some sentence structure
+        if '. ' not in text and len(text) < 80:
+            return False
+
+        return True
+
+    def is_relevant(self, title_lower, text_lower):
+        """Check if lowercased title/text are relevant to the topic"""
+        # Topic words in the title make the article relevant
+        for word in self.keywords:
+            if word in title_lower:
+                return True
+
+        # Otherwise they must appear multiple times in the text
+        matches_in_text = 0
+        for word in self.keywords:
+            if word in text_lower:
+                matches_in_text += 1
+                if matches_in_text >= 2:
+                    return True
+
+        # Also check for full topic phrase
+        return self.topic_lower in title_lower or self.topic_lower in text_lower
+
+    def evaluate(self, article):
+        """Return (quality, relevant, credible) verdicts for an article"""
+        text = article.text
+        if not self.is_quality(text):
+            return False, False, False
+
+        if not self.is_relevant(article.title.lower(), text.lower()):
+            return True, False, False
+
+        return True, True, self.source_index.is_credible(article.source)
+
+    def split(self, articles):
+        """
+        Filter articles in one pass
+        Returns (relevant, credible): quality+relevant articles, and those also from credible sources
+        """
+        relevant = []
+        credible = []
+        evaluate = self.evaluate
+        for article in articles:
+            _, is_relevant, is_credible = evaluate(article)
+            if is_relevant:
+                relevant.append(article)
+                if is_credible:
+                    credible.append(article)
+        return relevant, credible
+
+    def select(self, articles):
+        """Credible, relevant, quality articles, or all relevant ones if too few are credible"""
+        relevant, credible = self.split(articles)
+        # If credible filter is too strict, fall back to all relevant articles
+        if len(credible) < self.min_credible:
+            return relevant
+        return credible
@@ -0,0 +1,172 @@
+import os
+import re
+import time
+import sqlite3
+import threading
+
+from utils.article import Article
+from utils.cache import thread_connection
+
+class ArticleStore:
+    """
+    Local SQLite store of fetched articles with a full-text index (FTS5).
+
+    Articles are deduplicated by URL (or by a hash of the text when there is no
+    URL). The store also remembers which topics were fetched for which date
+    window, so a topic that is already covered can be answered from the local
+    index instead of News API.
+    """
+
+    token_pattern = re.compile(r'\w+', re.UNICODE)
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.executescript('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL UNIQUE,
+                text TEXT NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT NOT NULL,
+                source TEXT,
+                url TEXT NOT NULL,
+                published_at TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS articles_published ON articles (published_at);
+            CREATE TABLE IF NOT EXISTS coverage (
+                topic TEXT NOT NULL,
+                language TEXT NOT NULL,
+                from_date TEXT NOT NULL,
+                to_date TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                PRIMARY KEY (topic, language)
+            );
+        ''')
+
+        # Full-text index kept in sync with the articles table by triggers
+        try:
+            conn.executescript('''
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts
+                    USING fts5(title, text, content='articles', content_rowid='id');
+                CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+                    INSERT INTO articles_fts (rowid, title, text) VALUES (new.id, new.title, new.text);
+                END;
+                CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+                    INSERT INTO articles_fts (articles_fts, rowid, title, text)
+                        VALUES ('delete', old.id, old.title, old.text);
+                END;
+            ''')
+            self.full_text = True
+        except sqlite3.OperationalError:
+            # SQLite built without FTS5: fall back to LIKE matching
+            self.full_text = False
+
+    def _connect(self):
+        return thread_connection(self._local, self.path)
+
+    @staticmethod
+    def _article_key(article):
+        """Deduplication key: the URL, or a hash of the text for articles without one"""
+        return article.dedupe_key()
+
+    def add_articles(self, articles):
+        """Store articles, skipping ones already present; returns how many were new"""
+        now = time.time()
+        rows = [
+            (self._article_key(a), a.text, a.title, a.description or '', a.source,
+             a.url or '', a.published_at or '', now)
+            for a in articles
+        ]
+        conn = self._connect()
+        conn.execute('BEGIN')
+        try:
+            cursor = conn.executemany('''
+                INSERT OR IGNORE INTO articles
+                    (key, text, title, description, source, url, published_at, fetched_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+        return max(cursor.rowcount, 0)
+
+    def record_coverage(self, topic, language, from_date, to_date):
+        """Remember that a topic was fetched for a date window"""
+        self._connect().execute('''
+            INSERT OR REPLACE INTO coverage (topic, language, from_date, to_date, fetched_at)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (topic, language, from_date, to_date, time.time()))
+
+    def covers(self, topic, language, from_date, to_date, max_age=None):
+        """Check if a topic was fetched for a window containing from_date..to_date"""
+        row = self._connect().execute('''
+            SELECT from_date, to_date, fetched_at FROM coverage WHERE topic = ? AND language = ?
+        ''', (topic, language)).fetchone()
+        if row is None:
+            return False
+        covered_from, covered_to, fetched_at = row
+        if max_age is not None and time.time() - fetched_at > max_age:
+            return False
+        return covered_from <= from_date and covered_to >= to_date
+
+    def search(self, topic, from_date=None, to_date=None, limit=100):
+        """
+        Find stored articles matching every word of the topic, best matches first
+        Dates are YYYY-MM-DD strings compared against published_at
+        """
+        words = self.token_pattern.findall(topic.lower())
+        if not words:
+            return []
+
+        conditions = []
+        params = []
+        if from_date:
+            conditions.append('a.published_at >= ?')
+            params.append(from_date)
+        if to_date:
+            # published_at is a full timestamp, so include the whole end day
+            conditions.append('a.published_at < ?')
+            params.append(to_date + 'T99')
+
+        if self.full_text:
+            match = ' '.join('"' + word.replace('"', '""') + '"' for word in words)
+            sql = '''
+                SELECT a.text, a.title, a.description, a.source, a.url, a.published_at
+                FROM articles_fts JOIN articles a ON a.id = articles_fts.rowid
+                WHERE articles_fts MATCH ?
+            '''
+            params.insert(0, match)
+            order = 'ORDER BY articles_fts.rank'
+        else:
+            sql = '''
+                SELECT a.text, a.title, a.description, a.source, a.url, a.published_at
+                FROM articles a WHERE 1
+            '''
+            for word in words:
+                conditions.insert(0, 'lower(a.text) LIKE ?')
+                params.insert(0, f'%{word}%')
+            order = 'ORDER BY a.published_at DESC'
+
+        for condition in conditions:
+            sql += ' AND ' + condition
+        sql += f' {order} LIMIT ?'
+        params.append(limit)
+
+        return [Article(*row) for row in self._connect().execute(sql, params)]
+
+    def stats(self):
+        """Return the number of stored articles and covered topics"""
+        conn = self._connect()
+        return {
+            'articles': conn.execute('SELECT COUNT(*) FROM articles').fetchone()[0],
+            'topics': conn.execute('SELECT COUNT(*) FROM coverage').fetchone()[0],
+            'full_text': self.full_text
+        }
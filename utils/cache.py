@@ -0,0 +1,203 @@
+import os
+import time
+import pickle
+import sqlite3
+import threading
+from collections import OrderedDict
+
+def thread_connection(local, path):
+    """
+    Return the calling thread's SQLite connection to path, kept on a threading.local
+    (connections are not shared across threads or forks)
+    """
+    conn = getattr(local, 'conn', None)
+    if conn is None or local.pid != os.getpid():
+        conn = sqlite3.connect(path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        local.conn = conn
+        local.pid = os.getpid()
+    return conn
+
+class TTLCache:
+    """In-memory cache with per-entry TTL expiry and LRU eviction"""
+
+    def __init__(self, max_entries=256, ttl=300):
+        """
+        max_entries: entries kept before the least recently used is evicted
+        ttl: default lifetime in seconds (None means entries never expire)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.time():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl=None):
+        """Store value under key, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def ttl_remaining(self, key):
+        """Seconds until key expires (None if missing, inf if it never expires)"""
+        with self._lock:
+            entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is None:
+            return float('inf')
+        remaining = entry[0] - time.time()
+        return remaining if remaining > 0 else None
+
+    def delete(self, key):
+        """Remove key from the cache"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'memory',
+            'entries': len(self._data),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+class SQLiteCache:
+    """
+    On-disk cache with the same interface as TTLCache, backed by SQLite so that
+    every gunicorn worker on the host shares the same entries.
+    Values are pickled; LRU order is tracked with a last-access timestamp.
+    """
+
+    def __init__(self, path, max_entries=1024, ttl=300):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._local = threading.local()
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL,
+                accessed_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)')
+
+    def _connect(self):
+        return thread_connection(self._local, self.path)
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        conn = self._connect()
+        now = time.time()
+        row = conn.execute('SELECT value, expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+            value, expires_at = row
+            if expires_at is None or expires_at > now:
+                conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+                self.hits += 1
+                return pickle.loads(value)
+            conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+        self.misses += 1
+        return default
+
+    def set(self, key, value, ttl=None):
+        """Store value under key, evicting the least recently used entries if full"""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        conn = self._connect()
+        conn.execute(
+            'INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)',
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), expires_at, now)
+        )
+        count = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        if count > self.max_entries:
+            excess = count - self.max_entries
+            conn.execute(
+                'DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed_at LIMIT ?)',
+                (excess,)
+            )
+            self.evictions += excess
+
+    def ttl_remaining(self, key):
+        """Seconds until key expires (None if missing, inf if it never expires)"""
+        row = self._connect().execute('SELECT expires_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        if row[0] is None:
+            return float('inf')
+        remaining = row[0] - time.time()
+        return remaining if remaining > 0 else None
+
+    def delete(self, key):
+        """Remove key from the cache"""
+        self._connect().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        """Remove every entry"""
+        self._connect().execute('DELETE FROM cache')
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+
+    def stats(self):
+        """Return hit/miss counters (for this process) and current size"""
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'sqlite',
+            'entries': len(self),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+        }
+
+def create_cache(path=None, max_entries=256, ttl=300):
+    """Return a SQLiteCache when a path is given, otherwise an in-memory TTLCache"""
+    if path:
+        return SQLiteCache(path, max_entries=max_entries, ttl=ttl)
+    return TTLCache(max_entries=max_entries, ttl=ttl)
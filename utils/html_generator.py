@@ -1,3 +1,7 @@
+import hashlib
+
+from utils.instrumentation import metrics
+
 def escape_html(text):
     """Escape HTML special characters"""
     if text is None:
@@ -348,9 +352,13 @@ def generate_css():
     """
 
 def generate_form(is_configured, topic):
-    """Generate form HTML using Python"""
+    """Generate form HTML from the prebuilt halves around the topic value"""
     topic_value = escape_html(topic) if topic else ''
-    
+    prefix, suffix = FORM_PARTS[bool(is_configured)]
+    return prefix + topic_value + suffix
+
+def build_form(is_configured, topic_value):
+    """Build form HTML around an already escaped topic value"""
     status_html = ''
     if is_configured:
         status_html = '''
@@ -388,11 +396,15 @@ def generate_form(is_configured, topic):
 
 def generate_results_html(results, topic):
     """Generate results section using Python"""
+    return ''.join(iter_results_html(results, topic))
+
+def iter_results_html(results, topic):
+    """Yield the results section in chunks: stats, sources, then article cards one by one"""
     if not results:
-        return ''
+        return
     
     # Overall stats cards
-    stats_html = f'''
+    yield f'''
         <div class="results">
             <div class="overall-stats">
                 <h2>News Sentiment Analysis for "{escape_html(topic)}"</h2>
@@ -433,53 +445,57 @@ def generate_results_html(results, topic):
     
     # Top sources section
     if results.get('top_sources'):
-        stats_html += '''
+        sources_html = '''
             <div class="sources-section">
                 <h3>📰 Top News Sources</h3>
                 <div class="source-list">
         '''
         
         for source, count in results['top_sources']:
-            stats_html += f'''
+            sources_html += f'''
                 <div class="source-item">
                     <span class="source-name">{escape_html(source)}</span>
                     <span class="source-count">{count}</span>
                 </div>
             '''
         
-        stats_html += '''
+        sources_html += '''
                 </div>
             </div>
         '''
+        yield sources_html
     
     # Extreme examples
-    positive_articles_html = generate_articles_html(results['extreme_examples']['most_positive'], 'positive')
-    negative_articles_html = generate_articles_html(results['extreme_examples']['most_negative'], 'negative')
-    
-    stats_html += f'''
+    yield '''
             <div class="extreme-examples">
                 <div class="extreme-section">
                     <h3>🌟 Most Positive Coverage</h3>
-                    {positive_articles_html}
+                    '''
+    yield from iter_articles_html(results['extreme_examples']['most_positive'], 'positive')
+    yield '''
                 </div>
                 <div class="extreme-section">
                     <h3>⚠️ Most Negative Coverage</h3>
-                    {negative_articles_html}
+                    '''
+    yield from iter_articles_html(results['extreme_examples']['most_negative'], 'negative')
+    yield '''
                 </div>
             </div>
         </div>
     '''
-    
-    return stats_html
 
 def generate_articles_html(articles, sentiment_type):
     """Generate HTML for articles list"""
+    return ''.join(iter_articles_html(articles, sentiment_type))
+
+def iter_articles_html(articles, sentiment_type):
+    """Yield the HTML of each article card"""
     if not articles:
-        return '<p style="color: #666;">No articles found</p>'
+        yield '<p style="color: #666;">No articles found</p>'
+        return
     
-    articles_html = []
     for article in articles:
-        text = article['text']
+        text = article.text
         
         # Split title and description
         parts = text.split('. ', 1)
@@ -490,11 +506,11 @@ def generate_articles_html(articles, sentiment_type):
         if len(description) > 150:
             description = description[:150] + '...'
         
-        confidence = article['confidence'] * 100
-        source = article.get('source', 'Unknown')
-        url = article.get('url', '')
+        confidence = article.confidence * 100
+        source = article.source
+        url = article.url
         
-        article_html = f'''
+        yield f'''
             <div class="article-card {escape_html(sentiment_type)}">
                 <div class="article-title">{escape_html(title)}</div>
                 {f'<div class="article-text">{escape_html(description)}</div>' if description else ''}
@@ -505,25 +521,24 @@ def generate_articles_html(articles, sentiment_type):
                 </div>
             </div>
         '''
-        articles_html.append(article_html)
-    
-    return ''.join(articles_html)
 
-def generate_html_page(is_configured, results, error, topic):
-    """Main function to generate complete HTML page using only Python"""
-    
-    css = generate_css()
-    form_html = generate_form(is_configured, topic)
-    results_html = generate_results_html(results, topic) if results else ''
-    error_html = f'<div class="error">❌ {escape_html(error)}</div>' if error else ''
-    
-    full_html = f'''<!DOCTYPE html>
+def generate_error_html(error):
+    """Generate error message HTML"""
+    return f'<div class="error">❌ {escape_html(error)}</div>' if error else ''
+
+def generate_page_head():
+    """Return everything up to the form: doctype, head with the stylesheet link, and page header"""
+    return PAGE_HEAD
+
+def build_page_head(stylesheet_url):
+    """Build the page head linking to the stylesheet"""
+    return f'''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>News Sentiment Analyzer</title>
-    <style>{css}</style>
+    <link rel="stylesheet" href="{escape_html(stylesheet_url)}">
 </head>
 <body>
     <div class="container">
@@ -532,11 +547,54 @@ def generate_html_page(is_configured, results, error, topic):
             <p class="subtitle">Real-time sentiment analysis of global news coverage</p>
         </header>
 
-        {form_html}
-        {results_html}
-        {error_html}
+        '''
+
+# Invariant parts of every page, built once at import
+CSS = generate_css()
+CSS_ETAG = hashlib.sha1(CSS.encode('utf-8')).hexdigest()[:16]
+# Versioned so browsers can cache the stylesheet indefinitely
+STYLESHEET_URL = f'/assets/style.css?v={CSS_ETAG}'
+PAGE_HEAD = build_page_head(STYLESHEET_URL)
+
+_TOPIC_PLACEHOLDER = '\x00topic\x00'
+FORM_PARTS = {
+    state: tuple(build_form(state, _TOPIC_PLACEHOLDER).split(_TOPIC_PLACEHOLDER))
+    for state in (True, False)
+}
+
+PAGE_TAIL = '''
     </div>
 </body>
 </html>'''
-    
-    return full_html
+
+def iter_html_page(is_configured, results, error, topic):
+    """Yield the complete HTML page in chunks"""
+    yield generate_page_head()
+    yield generate_form(is_configured, topic)
+    yield '\n        '
+    if results:
+        yield from iter_results_html(results, topic)
+    yield '\n        '
+    yield generate_error_html(error)
+    yield PAGE_TAIL
+
+def iter_html_page_streaming(is_configured, topic, compute_results):
+    """
+    Yield the page for a streaming response: the head, CSS and form come out
+    immediately, then compute_results() runs and its (results, error) are rendered
+    chunk by chunk as they are produced
+    """
+    yield generate_page_head()
+    yield generate_form(is_configured, topic)
+    yield '\n        '
+    results, error = compute_results()
+    if results:
+        yield from iter_results_html(results, topic)
+    yield '\n        '
+    yield generate_error_html(error)
+    yield PAGE_TAIL
+
+def generate_html_page(is_configured, results, error, topic):
+    """Main function to generate complete HTML page using only Python"""
+    with metrics.stage('render'):
+        return ''.join(iter_html_page(is_configured, results, error, topic))
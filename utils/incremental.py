@@ -0,0 +1,110 @@
+import time
+import threading
+from datetime import datetime
+from collections import Counter
+
+from utils.aggregation import LABELS, LABEL_CODES
+
+class TopicState:
+    """
+    Running analysis state of one topic for incremental refreshes.
+
+    Keeps the keys (URL, or text hash for articles without one) and newest
+    published_at seen so far, running label counts, the current top-k extremes
+    and source tallies, so merging new articles costs time proportional to the
+    new articles only. The credible-only filter mode chosen on the first full
+    run is reused for later batches. The article list holds the newest
+    max_articles articles, latest batch first. Callers hold lock from unseen()
+    through merge() so one batch is never merged twice.
+    """
+
+    def __init__(self, top_k=5, max_articles=100):
+        self.top_k = top_k
+        self.max_articles = max_articles
+        self.credible_only = None
+        self.seen_keys = set()
+        self.latest_published = ''
+        self.refreshed_at = None
+        self.total_found = 0
+        self.counts = [0] * len(LABELS)
+        self.sources = Counter()
+        self.articles = []
+        self.extremes = {'positive': [], 'negative': []}  # (confidence, sequence, article)
+        self._sequence = 0
+        self.lock = threading.Lock()
+
+    def since(self):
+        """Timestamp to fetch newer articles from (News API accepts ISO 8601 without zone)"""
+        return self.latest_published[:19] or None
+
+    def age(self):
+        """Seconds since the last merge"""
+        return time.time() - self.refreshed_at if self.refreshed_at is not None else float('inf')
+
+    def unseen(self, articles):
+        """Return articles not merged before, each key once"""
+        batch_keys = set()
+        new_articles = []
+        for article in articles:
+            key = article.dedupe_key()
+            if key not in self.seen_keys and key not in batch_keys:
+                batch_keys.add(key)
+                new_articles.append(article)
+        return new_articles
+
+    def merge(self, fetched, analyzed, complete=True):
+        """
+        Merge a batch: fetched is every new article, analyzed the scored subset
+        that passed the filters. complete=False means the fetch was cut short, so
+        since() is not moved past articles that were never fetched.
+        """
+        for article in fetched:
+            self.seen_keys.add(article.dedupe_key())
+            if complete and article.published_at and article.published_at > self.latest_published:
+                self.latest_published = article.published_at
+        self.total_found += len(fetched)
+        self.refreshed_at = time.time()
+
+        # Newest batch first; the oldest articles drop off the end
+        self.articles[:0] = analyzed[:self.max_articles]
+        del self.articles[self.max_articles:]
+
+        for article in analyzed:
+            self.counts[LABEL_CODES.get(article.sentiment, 2)] += 1
+            self.sources[article.source] += 1
+
+            extremes = self.extremes.get(article.sentiment)
+            if extremes is not None:
+                # Highest confidence first, earlier articles first on ties
+                extremes.append((article.confidence, self._sequence, article))
+                extremes.sort(key=lambda entry: (-entry[0], entry[1]))
+                del extremes[self.top_k:]
+            self._sequence += 1
+
+    @property
+    def total_articles(self):
+        return sum(self.counts)
+
+    def results(self, topic):
+        """Build the results dict from the running state"""
+        total = self.total_articles
+        positive_count, negative_count, neutral_count = self.counts
+        return {
+            'topic': topic,
+            'timestamp': datetime.now().isoformat(),
+            'articles': list(self.articles),
+            'total_articles': total,
+            'total_found': self.total_found,
+            'filtered_count': self.total_found - total,
+            'positive_count': positive_count,
+            'negative_count': negative_count,
+            'neutral_count': neutral_count,
+            'positive_percentage': round((positive_count / total * 100) if total > 0 else 0, 2),
+            'negative_percentage': round((negative_count / total * 100) if total > 0 else 0, 2),
+            'neutral_percentage': round((neutral_count / total * 100) if total > 0 else 0, 2),
+            'extreme_examples': {
+                'most_positive': [entry[2] for entry in self.extremes['positive']],
+                'most_negative': [entry[2] for entry in self.extremes['negative']]
+            },
+            'top_sources': self.sources.most_common(10)
+        }
@@ -0,0 +1,139 @@
+import time
+import threading
+import contextvars
+from contextlib import nullcontext
+
+# Shared no-op context manager returned by Metrics.stage() when disabled
+_NULL_STAGE = nullcontext()
+
+# Stage timings of the current request, as a list of (stage, seconds)
+_request_timings = contextvars.ContextVar('request_timings', default=None)
+
+class _Stage:
+    """Context manager timing one execution of a pipeline stage"""
+
+    __slots__ = ('metrics', 'name', 'start')
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.metrics.observe(self.name, time.perf_counter() - self.start)
+        return False
+
+class Metrics:
+    """
+    Per-stage timers, counters and gauges for the analysis pipeline.
+
+    Timers and counters are process-wide and exported in Prometheus text
+    format; stage timings are also collected per request for the
+    Server-Timing header. When disabled, stage() returns a shared no-op
+    context manager and incr() returns immediately.
+    """
+
+    def __init__(self, enabled=False, prefix='social_pulse'):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._timers = {}    # stage -> [count, total seconds, max seconds]
+        self._counters = {}  # name -> value
+        self._gauges = {}    # name -> callable returning a number or a dict of numbers
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Return a context manager timing a pipeline stage"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def observe(self, name, seconds):
+        """Record one timed execution of a stage"""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append((name, seconds))
+
+    def incr(self, name, value=1):
+        """Increase a counter"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def register_gauge(self, name, fn):
+        """Register a callable read at export time (a number or a dict of numbers)"""
+        self._gauges[name] = fn
+
+    def start_request(self):
+        """Start collecting stage timings for the current request"""
+        if self.enabled:
+            _request_timings.set([])
+
+    def request_timings(self):
+        """Return the current request's total seconds per stage, in first-seen order"""
+        timings = _request_timings.get()
+        if not timings:
+            return {}
+        totals = {}
+        for name, seconds in timings:
+            totals[name] = totals.get(name, 0.0) + seconds
+        return totals
+
+    def server_timing_header(self):
+        """Format the current request's stage timings as a Server-Timing header value"""
+        return ', '.join(
+            f'{name};dur={seconds * 1000:.1f}' for name, seconds in self.request_timings().items()
+        )
+
+    def render_prometheus(self):
+        """Export all metrics in the Prometheus text exposition format"""
+        prefix = self.prefix
+        lines = []
+
+        with self._lock:
+            timers = {name: list(values) for name, values in self._timers.items()}
+            counters = dict(self._counters)
+
+        if timers:
+            lines.append(f'# TYPE {prefix}_stage_seconds summary')
+            for name, (count, total, _) in sorted(timers.items()):
+                lines.append(f'{prefix}_stage_seconds_count{{stage="{name}"}} {count}')
+                lines.append(f'{prefix}_stage_seconds_sum{{stage="{name}"}} {total:.6f}')
+            lines.append(f'# TYPE {prefix}_stage_seconds_max gauge')
+            for name, (_, _, longest) in sorted(timers.items()):
+                lines.append(f'{prefix}_stage_seconds_max{{stage="{name}"}} {longest:.6f}')
+
+        for name, value in sorted(counters.items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+
+        for name, fn in sorted(self._gauges.items()):
+            try:
+                value = fn()
+            except Exception:
+                continue
+            if value is None:
+                continue
+            if isinstance(value, dict):
+                for key, item in sorted(value.items()):
+                    if isinstance(item, (int, float)) and not isinstance(item, bool):
+                        lines.append(f'{prefix}_{name}_{key} {item}')
+            else:
+                lines.append(f'{prefix}_{name} {value}')
+
+        return '\n'.join(lines) + '\n'
+
+# Process-wide instance used by the pipeline modules; enabled by the app
+metrics = Metrics()
@@ -0,0 +1,74 @@
+import json
+import gzip
+import hashlib
+
+from utils.article import Article
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip is used when brotli is not installed
+    brotli = None
+
+# Responses smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 1024
+
+ARTICLE_LIST_FIELDS = ('articles',)
+
+def parse_fields(value):
+    """Parse a comma-separated field list from a query parameter (None means all fields)"""
+    if not value:
+        return None
+    fields = tuple(field.strip() for field in value.split(',') if field.strip())
+    return fields or None
+
+def _article_payload(article, article_fields):
+    """Convert an Article to a dict, keeping only article_fields if given"""
+    data = article.to_dict() if isinstance(article, Article) else dict(article)
+    if article_fields is None:
+        return data
+    return {key: data[key] for key in article_fields if key in data}
+
+def results_payload(results, fields=None, article_fields=None):
+    """
+    Build the JSON-ready payload for analysis results
+    fields selects top-level keys, article_fields selects keys of every article
+    """
+    payload = {}
+    for key, value in results.items():
+        if fields is not None and key not in fields:
+            continue
+        if key in ARTICLE_LIST_FIELDS:
+            value = [_article_payload(a, article_fields) for a in value]
+        elif key == 'extreme_examples':
+            value = {
+                name: [_article_payload(a, article_fields) for a in articles]
+                for name, articles in value.items()
+            }
+        elif key == 'top_sources':
+            value = [[source, count] for source, count in value]
+        payload[key] = value
+    return payload
+
+def encode_json(payload):
+    """Encode a payload as compact UTF-8 JSON"""
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+def compress(body, accept_encoding):
+    """
+    Compress body with the best encoding the client accepts
+    Returns (body, content_encoding or None)
+    """
+    if len(body) < MIN_COMPRESS_BYTES or not accept_encoding:
+        return body, None
+
+    accepted = {part.split(';')[0].strip().lower() for part in accept_encoding.split(',')}
+    if brotli is not None and 'br' in accepted:
+        return brotli.compress(body, quality=5), 'br'
+    if 'gzip' in accepted:
+        return gzip.compress(body, compresslevel=6), 'gzip'
+    return body, None
+
+def results_etag(cache_key, results, fields=None, article_fields=None):
+    """ETag for a cached result and field selection (no need to serialize the body)"""
+    raw = f'{cache_key}|{results.get("timestamp")}|{fields}|{article_fields}'
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:20]
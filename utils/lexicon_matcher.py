@@ -0,0 +1,65 @@
+import re
+
+class LexiconMatcher:
+    """
+    Match several word lists against a text in a single pass over its tokens.
+
+    Counts are identical to running `word in text_lower` for every word of
+    every list: lexicon words are plain lowercase letters, so any occurrence
+    lies inside one run of letters. Each distinct run is resolved once and
+    the words it contains are remembered for later texts.
+    """
+
+    token_pattern = re.compile(r'[a-z]+')
+    word_pattern = re.compile(r'[a-z]+$')
+
+    def __init__(self, lexicons, max_cached_tokens=50000):
+        """
+        lexicons: dict mapping a lexicon name to a list of lowercase words
+        """
+        self.names = list(lexicons)
+        self.max_cached_tokens = max_cached_tokens
+
+        # Flatten every list into one table of (word, lexicon index) entries
+        self._entries = []
+        self._entry_lexicon = []
+        for index, name in enumerate(self.names):
+            for word in lexicons[name]:
+                if not self.word_pattern.match(word):
+                    raise ValueError(f'Lexicon words must be lowercase letters only: {word!r}')
+                self._entries.append(word)
+                self._entry_lexicon.append(index)
+
+        self._min_length = min((len(word) for word in self._entries), default=1)
+        self._token_hits = {}
+
+    def _resolve(self, token):
+        """Find the entries contained in a token and remember them"""
+        if len(token) < self._min_length:
+            hits = ()
+        else:
+            hits = tuple(i for i, word in enumerate(self._entries) if word in token)
+
+        if len(self._token_hits) >= self.max_cached_tokens:
+            self._token_hits.clear()
+        self._token_hits[token] = hits
+        return hits
+
+    def count(self, text_lower):
+        """
+        Count how many words of each lexicon are present in text
+        Returns a list of counts in the order of self.names
+        """
+        matched = set()
+        token_hits = self._token_hits
+        for token in set(self.token_pattern.findall(text_lower)):
+            hits = token_hits.get(token)
+            if hits is None:
+                hits = self._resolve(token)
+            if hits:
+                matched.update(hits)
+
+        counts = [0] * len(self.names)
+        for entry in matched:
+            counts[self._entry_lexicon[entry]] += 1
+        return counts
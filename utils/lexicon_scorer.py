@@ -0,0 +1,186 @@
+import re
+
+# (polarity, subjectivity) of scored words. Adjectives and common modifiers use
+# the values of TextBlob's pattern lexicon so both backends agree on them; news
+# verbs and nouns that TextBlob leaves unscored carry smaller hand-set weights.
+WORD_WEIGHTS = {
+    # General adjectives
+    'good': (0.70, 0.60), 'great': (0.80, 0.75), 'bad': (-0.70, 0.67), 'best': (1.00, 0.30),
+    'worst': (-1.00, 1.00), 'better': (0.50, 0.50), 'worse': (-0.40, 0.60),
+    'excellent': (1.00, 1.00), 'amazing': (0.60, 0.90), 'wonderful': (1.00, 1.00),
+    'fantastic': (0.40, 0.90), 'awesome': (1.00, 1.00), 'happy': (0.80, 1.00),
+    'sad': (-0.50, 1.00), 'perfect': (1.00, 1.00), 'beautiful': (0.85, 1.00),
+    'incredible': (0.90, 0.90), 'brilliant': (0.90, 1.00), 'outstanding': (0.50, 0.88),
+    'superb': (1.00, 1.00), 'fabulous': (0.40, 1.00), 'nice': (0.60, 1.00),
+    'poor': (-0.40, 0.60), 'terrible': (-1.00, 1.00), 'awful': (-1.00, 1.00),
+    'horrible': (-1.00, 1.00), 'disappointing': (-0.60, 0.70), 'angry': (-0.50, 1.00),
+    'useless': (-0.50, 0.20), 'pathetic': (-1.00, 1.00), 'disgusting': (-1.00, 1.00),
+    'annoying': (-0.80, 0.90), 'frustrating': (-0.40, 0.90), 'ugly': (-0.70, 1.00),
+    'stupid': (-0.80, 1.00), 'boring': (-1.00, 1.00), 'exceptional': (0.67, 1.00),
+    'phenomenal': (0.50, 0.50), 'magnificent': (1.00, 1.00), 'tragic': (-0.75, 0.75),
+    'devastating': (-1.00, 1.00), 'dangerous': (-0.60, 0.90), 'controversial': (0.55, 0.95),
+    'corrupt': (-0.50, 1.00), 'disastrous': (-0.70, 0.80), 'alarming': (-0.10, 0.60),
+    'strong': (0.43, 0.73), 'weak': (-0.38, 0.62), 'high': (0.16, 0.54), 'new': (0.14, 0.45),
+    'major': (0.06, 0.50), 'significant': (0.38, 0.88), 'serious': (-0.33, 0.67),
+    'sharp': (-0.12, 0.75), 'huge': (0.40, 0.90), 'small': (-0.25, 0.40), 'large': (0.21, 0.43),
+    'positive': (0.23, 0.55), 'negative': (-0.30, 0.40), 'successful': (0.75, 0.95),
+    'effective': (0.60, 0.80), 'safe': (0.50, 0.50), 'secure': (0.40, 0.60),
+    'healthy': (0.50, 0.50), 'unhealthy': (-0.40, 0.70), 'fair': (0.70, 0.90),
+    'unfair': (-0.50, 1.00), 'free': (0.40, 0.80), 'rich': (0.38, 0.75), 'wealthy': (0.50, 1.00),
+    'bright': (0.70, 0.80), 'dark': (-0.15, 0.40), 'clear': (0.10, 0.38), 'easy': (0.43, 0.83),
+    'hard': (-0.29, 0.54), 'difficult': (-0.50, 1.00), 'tough': (-0.39, 0.83),
+    'complex': (-0.30, 0.40), 'important': (0.40, 1.00), 'popular': (0.60, 0.90),
+    'confident': (0.50, 0.83), 'fearful': (-0.90, 1.00), 'afraid': (-0.60, 0.90),
+    'pleased': (0.50, 1.00), 'glad': (0.50, 1.00), 'proud': (0.80, 1.00),
+    'delighted': (0.70, 0.70), 'thrilled': (0.60, 0.70), 'excited': (0.38, 0.75),
+    'impressive': (1.00, 1.00), 'remarkable': (0.75, 0.75), 'innovative': (0.50, 1.00),
+    'creative': (0.50, 1.00), 'unprecedented': (0.60, 0.90),
+
+    # Frequent modifiers that move TextBlob's average
+    'more': (0.50, 0.50), 'most': (0.50, 0.50), 'many': (0.50, 0.50), 'much': (0.20, 0.20),
+    'first': (0.25, 0.33), 'other': (-0.12, 0.38), 'own': (0.60, 1.00), 'few': (-0.20, 0.10),
+    'able': (0.50, 0.62), 'real': (0.20, 0.30), 'certain': (0.21, 0.57), 'full': (0.35, 0.55),
+    'whole': (0.20, 0.40), 'late': (-0.30, 0.60), 'early': (0.10, 0.30), 'top': (0.50, 0.50),
+    'economic': (0.20, 0.20), 'main': (0.17, 0.33), 'special': (0.36, 0.57),
+    'previous': (-0.17, 0.17), 'available': (0.40, 0.40), 'common': (-0.30, 0.50),
+    'military': (-0.10, 0.10), 'due': (-0.12, 0.38), 'expected': (-0.10, 0.40),
+
+    # Verbs and nouns scored by TextBlob
+    'win': (0.80, 0.40), 'wins': (0.30, 0.20), 'winning': (0.50, 0.75), 'loses': (-0.30, 0.10),
+    'fail': (-0.50, 0.30), 'fails': (-0.50, 0.30), 'failed': (-0.50, 0.30),
+    'succeeds': (0.70, 0.10), 'welcome': (0.80, 0.90), 'celebrated': (0.35, 0.75),
+    'failure': (-0.32, 0.30), 'killed': (-0.20, 0.00), 'success': (0.30, 0.00),
+    'love': (0.50, 0.60), 'hate': (-0.80, 0.90), 'enjoy': (0.40, 0.50), 'suffers': (-0.60, 0.70),
+
+    # News verbs and nouns (not scored by TextBlob)
+    'optimistic': (0.40, 0.70), 'pessimistic': (-0.40, 0.70), 'hopeful': (0.40, 0.70),
+    'worried': (-0.40, 0.70), 'uncertain': (-0.20, 0.60), 'robust': (0.30, 0.40),
+    'resilient': (0.30, 0.40), 'stable': (0.20, 0.30), 'unstable': (-0.30, 0.50),
+    'unsafe': (-0.50, 0.60), 'severe': (-0.40, 0.60), 'catastrophic': (-0.80, 0.80),
+    'won': (0.40, 0.20), 'lost': (-0.30, 0.20), 'losing': (-0.30, 0.20),
+    'gain': (0.25, 0.10), 'gains': (0.25, 0.10), 'gained': (0.25, 0.10),
+    'surge': (0.25, 0.20), 'surges': (0.25, 0.20), 'surged': (0.25, 0.20),
+    'soar': (0.30, 0.20), 'soars': (0.30, 0.20), 'soared': (0.30, 0.20),
+    'rally': (0.25, 0.20), 'rallies': (0.25, 0.20), 'rallied': (0.25, 0.20),
+    'boost': (0.30, 0.20), 'boosts': (0.30, 0.20), 'boosted': (0.30, 0.20),
+    'improve': (0.30, 0.20), 'improves': (0.30, 0.20), 'improved': (0.30, 0.20),
+    'recovery': (0.25, 0.10), 'recovered': (0.25, 0.10), 'growth': (0.20, 0.10),
+    'praise': (0.40, 0.50), 'praised': (0.40, 0.50), 'celebrate': (0.40, 0.50),
+    'celebrates': (0.40, 0.50), 'award': (0.30, 0.20), 'achievement': (0.40, 0.30),
+    'victory': (0.50, 0.30), 'breakthrough': (0.50, 0.40), 'progress': (0.25, 0.20),
+    'innovation': (0.25, 0.30), 'peace': (0.30, 0.20), 'agreement': (0.15, 0.10),
+    'profit': (0.20, 0.10), 'profits': (0.20, 0.10), 'hope': (0.25, 0.40),
+    'triumph': (0.60, 0.50), 'revolutionary': (0.40, 0.60),
+    'plunge': (-0.35, 0.20), 'plunges': (-0.35, 0.20), 'plunged': (-0.35, 0.20),
+    'crash': (-0.40, 0.20), 'crashes': (-0.40, 0.20), 'crashed': (-0.40, 0.20),
+    'slump': (-0.30, 0.20), 'slumps': (-0.30, 0.20), 'slumped': (-0.30, 0.20),
+    'decline': (-0.20, 0.10), 'declines': (-0.20, 0.10), 'declined': (-0.20, 0.10),
+    'criticized': (-0.40, 0.50), 'criticism': (-0.35, 0.50), 'condemned': (-0.50, 0.60),
+    'slammed': (-0.40, 0.50), 'blamed': (-0.30, 0.40), 'defeat': (-0.40, 0.30),
+    'crisis': (-0.50, 0.40), 'disaster': (-0.60, 0.50), 'catastrophe': (-0.70, 0.50),
+    'threat': (-0.40, 0.40), 'risk': (-0.25, 0.30), 'risks': (-0.25, 0.30),
+    'danger': (-0.40, 0.40), 'concern': (-0.25, 0.40), 'concerns': (-0.25, 0.40),
+    'warning': (-0.25, 0.30), 'warns': (-0.25, 0.30), 'fears': (-0.35, 0.50),
+    'scandal': (-0.50, 0.50), 'corruption': (-0.50, 0.50), 'fraud': (-0.50, 0.40),
+    'lawsuit': (-0.25, 0.20), 'layoffs': (-0.40, 0.20), 'losses': (-0.30, 0.10),
+    'recession': (-0.40, 0.20), 'bankruptcy': (-0.50, 0.20), 'collapse': (-0.50, 0.30),
+    'collapsed': (-0.50, 0.30), 'death': (-0.40, 0.20), 'deaths': (-0.40, 0.20),
+    'died': (-0.40, 0.20), 'war': (-0.40, 0.20), 'attack': (-0.40, 0.20),
+    'violence': (-0.50, 0.30), 'conflict': (-0.30, 0.20), 'injured': (-0.35, 0.20),
+    'victims': (-0.30, 0.20), 'damage': (-0.30, 0.20), 'destroyed': (-0.40, 0.20),
+    'struggles': (-0.30, 0.40), 'struggling': (-0.30, 0.40), 'suffered': (-0.40, 0.40)
+}
+
+# Words that scale the next scored word, as TextBlob does for "very"
+INTENSIFIERS = {
+    'very': 1.3, 'really': 1.2, 'extremely': 1.5, 'highly': 1.3, 'incredibly': 1.5,
+    'deeply': 1.3, 'so': 1.2, 'too': 1.2, 'slightly': 0.5, 'somewhat': 0.7, 'barely': 0.5
+}
+
+# Words that invert the next scored word within NEGATION_WINDOW tokens
+NEGATIONS = {
+    'not', 'no', 'never', 'without', 'hardly', 'neither', 'nor', 'cannot', 'none', 'nothing',
+    "don't", "doesn't", "didn't", "isn't", "aren't", "wasn't", "weren't", "won't", "can't",
+    "couldn't", "shouldn't", "wouldn't", "haven't", "hasn't", "hadn't", "mustn't", "ain't"
+}
+NEGATION_WINDOW = 3
+
+# TextBlob halves and inverts the polarity of negated words
+NEGATION_FACTOR = -0.5
+
+# Token kinds in the compiled table
+_WORD, _INTENSIFIER, _NEGATION = 0, 1, 2
+
+class LexiconScorer:
+    """
+    Token-based polarity scorer that stands in for TextBlob.
+
+    Text is split into word tokens and looked up in one compiled table of
+    weighted words, intensifiers and negations. Like TextBlob, polarity and
+    subjectivity are the averages over scored words, an intensifier scales
+    the word right after it and a negation inverts (and halves) the next
+    scored word.
+    """
+
+    # Words, keeping negated contractions such as "don't" whole
+    token_pattern = re.compile(r"[a-z]+(?:'t)?")
+
+    def __init__(self, weights=None, intensifiers=None, negations=None):
+        self.weights = dict(WORD_WEIGHTS if weights is None else weights)
+        self.intensifiers = dict(INTENSIFIERS if intensifiers is None else intensifiers)
+        self.negations = set(NEGATIONS if negations is None else negations)
+
+        self._table = {}
+        for word in self.negations:
+            self._table[word] = (_NEGATION, 0.0, 0.0)
+        for word, factor in self.intensifiers.items():
+            self._table[word] = (_INTENSIFIER, factor, 0.0)
+        for word, (polarity, subjectivity) in self.weights.items():
+            self._table[word] = (_WORD, polarity, subjectivity)
+
+    def config(self):
+        """Everything that affects scores, for cache fingerprints"""
+        return {
+            'weights': self.weights,
+            'intensifiers': self.intensifiers,
+            'negations': sorted(self.negations)
+        }
+
+    def score(self, text_lower):
+        """
+        Score lowercased text
+        Returns (polarity in [-1, 1], subjectivity in [0, 1]); (0.0, 0.0) when no word is scored
+        """
+        table = self._table
+        polarity_sum = 0.0
+        subjectivity_sum = 0.0
+        scored = 0
+        factor = 1.0
+        negated = 0
+
+        for token in self.token_pattern.findall(text_lower.replace('’', "'")):
+            entry = table.get(token)
+            if entry is None:
+                factor = 1.0
+                if negated:
+                    negated -= 1
+                continue
+
+            kind, value, subjectivity = entry
+            if kind == _WORD:
+                polarity = value * factor
+                if negated:
+                    polarity *= NEGATION_FACTOR
+                    negated = 0
+                polarity_sum += polarity
+                subjectivity_sum += min(subjectivity * factor, 1.0)
+                scored += 1
+                factor = 1.0
+            elif kind == _INTENSIFIER:
+                factor *= value
+            else:
+                negated = NEGATION_WINDOW
+
+        if not scored:
+            return 0.0, 0.0
+        return max(-1.0, min(1.0, polarity_sum / scored)), min(1.0, subjectivity_sum / scored)
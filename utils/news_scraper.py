@@ -1,110 +1,547 @@
+import os
+import time
+import random
+import asyncio
+import sqlite3
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 
+from utils.article import Article
+from utils.instrumentation import metrics
+
+try:
+    import httpx
+except ImportError:  # Only needed for the async pipeline (ascrape)
+    httpx = None
+
 class NewsScraper:
-    def __init__(self, api_key):
+    PAGE_SIZE = 100  # API max is 100
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    
+    def __init__(self, api_key, cache=None, language='en', window_days=30,
+                 base_url='https://newsapi.org/v2/everything', max_workers=4,
+                 max_retries=3, backoff=0.5, pool_size=10, connect_timeout=3.05,
+                 read_timeout=10, retry_budget=10, store=None, store_mode='write', store_max_age=3600):
         self.api_key = api_key
-        self.base_url = 'https://newsapi.org/v2/everything'
+        self.base_url = base_url
+        self.language = language
+        self.window_days = window_days
+        # Optional TTLCache/SQLiteCache for processed results (see utils.cache)
+        self.cache = cache
+        # Optional ArticleStore (see utils.article_store). Fetched articles are always
+        # persisted; in 'query' mode covered topics are served from the local index until
+        # their last fetch is store_max_age seconds old (None never refetches a covered topic)
+        self.store = store
+        self.store_mode = store_mode
+        self.store_max_age = store_max_age
+        # Concurrent page requests when more than one page is needed
+        self.max_workers = max_workers
+        # Retries for 429/5xx responses and failed connections, with jittered exponential backoff
+        self.max_retries = max_retries
+        self.backoff = backoff
+        # Seconds a request may spend retrying in total; keep it well below the
+        # server's worker timeout (gunicorn: 30s) so throttling surfaces as an error
+        self.retry_budget = retry_budget
+        # Keep-alive connection pool shared by all requests from this process
+        self.pool_size = max(pool_size, max_workers)
+        self.timeout = (connect_timeout, read_timeout)
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+        self._async_client = None
+        self._async_loop = None
+        self.request_count = 0
+        self.retry_count = 0
     
     def is_configured(self):
         """Check if API key is configured"""
         return self.api_key and self.api_key != 'your_news_api_key_here'
     
-    def scrape(self, topic, limit=100):
+    @staticmethod
+    def normalize_topic(topic):
+        """Normalize a topic for use in cache keys (case and whitespace insensitive)"""
+        return ' '.join(str(topic).lower().split())
+    
+    def _date_window(self):
+        """Return the (from, to) date strings of the search window"""
+        to_date = datetime.now()
+        from_date = to_date - timedelta(days=self.window_days)
+        return from_date.strftime('%Y-%m-%d'), to_date.strftime('%Y-%m-%d')
+    
+    def cache_key(self, topic, limit=100):
+        """Cache key for a topic search: normalized topic, language, date window and limit"""
+        from_date, to_date = self._date_window()
+        return f'scrape|{self.normalize_topic(topic)}|{self.language}|{from_date}|{to_date}|{limit}'
+    
+    def _get_session(self):
+        """Return the pooled HTTP session, creating a new one after a fork"""
+        with self._lock:
+            if self._session is None or self._session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=1,
+                    pool_maxsize=self.pool_size,
+                    max_retries=0  # Retries are handled in _get
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+                self._session_pid = os.getpid()
+            return self._session
+    
+    def _get(self, params):
+        """GET base_url on the pooled session, retrying 429/5xx responses and connection errors"""
+        session = self._get_session()
+        deadline = time.monotonic() + self.retry_budget
+        attempt = 0
+        while True:
+            with self._lock:
+                self.request_count += 1
+            try:
+                response = session.get(self.base_url, params=params, timeout=self.timeout)
+            except requests.exceptions.ConnectionError:
+                delay = self._retry_delay(None, attempt)
+                if not self._can_retry(attempt, delay, deadline):
+                    raise
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+                delay = self._retry_delay(response, attempt)
+                # Give up now if the server asks for a longer wait than the budget allows
+                if not self._can_retry(attempt, delay, deadline):
+                    return response
+                response.close()
+            
+            with self._lock:
+                self.retry_count += 1
+            time.sleep(delay)
+            attempt += 1
+    
+    def http_stats(self):
+        """Return request, retry and connection reuse counters for this process"""
+        connections = 0
+        pool_requests = 0
+        session = self._session
+        if session is not None and self._session_pid == os.getpid():
+            pools = session.get_adapter(self.base_url).poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    pool_requests += pool.num_requests
+        return {
+            'requests': self.request_count,
+            'retries': self.retry_count,
+            'connections_opened': connections,
+            'connections_reused': max(pool_requests - connections, 0)
+        }
+    
+    def _get_async_client(self):
+        """Return the pooled httpx client for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                ),
+                timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0])
+            )
+            self._async_loop = loop
+        return self._async_client
+    
+    async def _aget(self, params):
+        """Async variant of _get with the same retry policy"""
+        client = self._get_async_client()
+        deadline = time.monotonic() + self.retry_budget
+        attempt = 0
+        while True:
+            self.request_count += 1
+            try:
+                response = await client.get(self.base_url, params=params)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                delay = self._retry_delay(None, attempt)
+                if not self._can_retry(attempt, delay, deadline):
+                    raise
+            else:
+                if response.status_code not in self.RETRY_STATUSES:
+                    return response
+                delay = self._retry_delay(response, attempt)
+                if not self._can_retry(attempt, delay, deadline):
+                    return response
+            
+            self.retry_count += 1
+            await asyncio.sleep(delay)
+            attempt += 1
+    
+    async def aclose(self):
+        """Close the async HTTP client"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            self._async_loop = None
+    
+    def cache_ttl_remaining(self, topic, limit=100):
+        """Seconds until the cached results for a topic expire (None if not cached)"""
+        if self.cache is None:
+            return None
+        return self.cache.ttl_remaining(self.cache_key(topic, limit))
+    
+    def cache_stats(self):
+        """Return hit/miss counters of the result cache (None if caching is disabled)"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def scrape(self, topic, limit=100, refresh=False):
         """
         Scrape news articles for a given topic
         Returns list of articles with text, source, and URL
         """
+        with metrics.stage('scrape'):
+            articles = list(self.iter_articles(topic, limit, refresh))
+        metrics.incr('articles_fetched', len(articles))
+        return articles
+    
+    def iter_articles(self, topic, limit=100, refresh=False):
+        """
+        Yield processed articles for a topic as their pages arrive.
+        Pages after the first are fetched concurrently but yielded in page order.
+        With refresh=True the cache and store are bypassed for reading and then overwritten.
+        """
+        if not self.is_configured():
+            raise Exception('News API key not configured')
+        
+        if not refresh:
+            saved = self._saved_articles(topic, limit)
+            if saved is not None:
+                yield from saved
+                return
+        
+        key = self.cache_key(topic, limit) if self.cache is not None else None
+        if key is None and self.store is None:
+            yield from self._iter_fetched(topic, limit)
+            return
+        
+        articles = []
+        for article in self._iter_fetched(topic, limit):
+            articles.append(article.copy())
+            yield article
+        # Only complete result sets are cached and stored
+        if key is not None:
+            self.cache.set(key, articles)
+        self._save_to_store(topic, articles)
+    
+    def _saved_articles(self, topic, limit):
+        """
+        Articles for a topic from the result cache or, in 'query' mode, the
+        article store; returns None when neither has them
+        """
+        key = self.cache_key(topic, limit) if self.cache is not None else None
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                # Callers annotate the articles, so never hand out the cached ones
+                return [article.copy() for article in cached]
+        
+        stored = self._query_store(topic, limit)
+        if stored is not None and key is not None:
+            self.cache.set(key, [article.copy() for article in stored])
+        return stored
+    
+    def _save_articles(self, topic, limit, articles):
+        """Cache and store a freshly fetched result set"""
+        if self.cache is not None:
+            self.cache.set(self.cache_key(topic, limit), [article.copy() for article in articles])
+        self._save_to_store(topic, articles)
+    
+    def _query_store(self, topic, limit):
+        """
+        Serve a topic from the local article store when in 'query' mode and the
+        topic was already fetched for the current window; returns None otherwise
+        """
+        if self.store is None or self.store_mode != 'query':
+            return None
+        
+        from_date, to_date = self._date_window()
+        try:
+            if not self.store.covers(self.normalize_topic(topic), self.language,
+                                     from_date, to_date, self.store_max_age):
+                return None
+            return self.store.search(topic, from_date, to_date, limit)
+        except sqlite3.Error as e:
+            print(f"Article store query failed: {e}")
+            return None
+    
+    def _save_to_store(self, topic, articles):
+        """Persist freshly fetched articles and record the topic's coverage"""
+        if self.store is None:
+            return
+        
+        from_date, to_date = self._date_window()
+        try:
+            self.store.add_articles(articles)
+            self.store.record_coverage(self.normalize_topic(topic), self.language, from_date, to_date)
+        except sqlite3.Error as e:
+            print(f"Article store update failed: {e}")
+    
+    def scrape_since(self, topic, since, limit=1000):
+        """
+        Fetch articles published at or after since (ISO 8601 timestamp), newest
+        first, paging until the window is used up; bypasses the cache and store
+        and is used for incremental refreshes
+        Returns (articles, complete): complete is False when limit or the plan's
+        page limit cut the window short, so older articles in it were not fetched
+        """
         if not self.is_configured():
             raise Exception('News API key not configured')
         
+        try:
+            to_date = self._date_window()[1]
+            page_size = min(limit, self.PAGE_SIZE)
+            seen_urls = set()
+            articles = []
+            page = 1
+            while True:
+                data = self._fetch_page(topic, page, page_size, since, to_date, sort_by='publishedAt')
+                if data is None:
+                    # Plan limit reached
+                    return articles, False
+                articles.extend(self._process_articles(data.get('articles', []), seen_urls))
+                if page * page_size >= data.get('totalResults', 0):
+                    return articles, True
+                if page * page_size >= limit:
+                    return articles, False
+                page += 1
+        
+        except requests.exceptions.Timeout:
+            raise Exception('Request timed out. Please try again.')
+        except requests.exceptions.RequestException as e:
+            raise Exception(f'Network error: {str(e)}')
+        except Exception as e:
+            if 'News API' in str(e):
+                raise
+            raise Exception(f'Error scraping news: {str(e)}')
+    
+    def _iter_fetched(self, topic, limit):
+        """Fetch and process articles from News API page by page, bypassing the cache"""
         try:
             # Calculate date range (last 30 days for better results)
-            to_date = datetime.now()
-            from_date = to_date - timedelta(days=30)
-            
-            # Make API request with improved parameters
-            params = {
-                'q': topic,  # Search query
-                'apiKey': self.api_key,
-                'language': 'en',
-                'sortBy': 'relevancy',  # Sort by relevance instead of date
-                'pageSize': min(limit, 100),  # API max is 100
-                'from': from_date.strftime('%Y-%m-%d'),
-                'to': to_date.strftime('%Y-%m-%d')
-            }
+            from_date, to_date = self._date_window()
+            page_size = min(limit, self.PAGE_SIZE)
             
-            response = requests.get(self.base_url, params=params, timeout=10)
+            # The first page tells us how many results exist
+            data = self._fetch_page(topic, 1, page_size, from_date, to_date)
+            total_results = data.get('totalResults', 0)
+            pages = min(-(-limit // page_size), -(-total_results // page_size))
             
-            if response.status_code == 426:
-                raise Exception('News API requires upgrade. The free tier has limited access. Please try a more general topic.')
+            seen_urls = set()
+            count = 0
+            for article in self._process_articles(data.get('articles', []), seen_urls):
+                yield article
+                count += 1
+                if count >= limit:
+                    return
             
-            if response.status_code == 401:
-                raise Exception('Invalid News API key. Please check your NEWS_API_KEY.')
+            if pages < 2:
+                return
             
-            if response.status_code == 429:
-                raise Exception('Rate limit exceeded. Please wait a moment and try again.')
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            if data.get('status') != 'ok':
-                error_msg = data.get('message', 'Unknown error from News API')
-                raise Exception(f'News API error: {error_msg}')
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, pages - 1)) as executor:
+                futures = [
+                    executor.submit(self._fetch_page, topic, page, page_size, from_date, to_date)
+                    for page in range(2, pages + 1)
+                ]
+                try:
+                    for future in futures:
+                        data = future.result()
+                        if data is None:
+                            # Plan limit reached, keep what we have
+                            break
+                        for article in self._process_articles(data.get('articles', []), seen_urls):
+                            yield article
+                            count += 1
+                            if count >= limit:
+                                return
+                finally:
+                    for future in futures:
+                        future.cancel()
+        
+        except requests.exceptions.Timeout:
+            raise Exception('Request timed out. Please try again.')
+        except requests.exceptions.RequestException as e:
+            raise Exception(f'Network error: {str(e)}')
+        except Exception as e:
+            if 'News API' in str(e):
+                raise
+            raise Exception(f'Error scraping news: {str(e)}')
+    
+    async def ascrape(self, topic, limit=100):
+        """
+        Async variant of scrape() built on httpx, sharing the same result cache
+        Returns list of articles with text, source, and URL
+        """
+        if not self.is_configured():
+            raise Exception('News API key not configured')
+        
+        if httpx is None:
+            raise Exception('The async pipeline requires httpx to be installed')
+        
+        # The cache and store may be SQLite files, so their I/O runs off the event loop
+        loop = asyncio.get_running_loop()
+        saved = await loop.run_in_executor(None, self._saved_articles, topic, limit)
+        if saved is not None:
+            return saved
+        
+        articles = await self._afetch(topic, limit)
+        await loop.run_in_executor(None, self._save_articles, topic, limit, articles)
+        return articles
+    
+    async def _afetch(self, topic, limit):
+        """Fetch and process articles without blocking the event loop, bypassing the cache"""
+        try:
+            from_date, to_date = self._date_window()
+            page_size = min(limit, self.PAGE_SIZE)
             
-            articles_data = data.get('articles', [])
+            # The first page tells us how many results exist
+            data = await self._afetch_page(topic, 1, page_size, from_date, to_date)
+            total_results = data.get('totalResults', 0)
+            pages = min(-(-limit // page_size), -(-total_results // page_size))
             
-            if not articles_data:
-                return []
+            seen_urls = set()
+            articles = list(self._process_articles(data.get('articles', []), seen_urls))
             
-            # Process articles
-            processed_articles = []
-            for article in articles_data:
-                # Skip articles without content
-                if not article.get('title') and not article.get('description'):
-                    continue
+            if pages > 1 and len(articles) < limit:
+                semaphore = asyncio.Semaphore(self.max_workers)
                 
-                # Combine title and description for better analysis
-                title = article.get('title', '').strip()
-                description = article.get('description', '').strip()
-                content = article.get('content', '').strip()
+                async def fetch(page):
+                    async with semaphore:
+                        return await self._afetch_page(topic, page, page_size, from_date, to_date)
                 
-                # Create full text (prioritize description over content)
-                text_parts = []
-                if title:
-                    text_parts.append(title)
-                if description:
-                    text_parts.append(description)
-                elif content:
-                    # Use content if no description, but clean it
-                    content_clean = content.split('[+')[0].strip()  # Remove "read more" parts
-                    if content_clean:
-                        text_parts.append(content_clean)
-                
-                full_text = '. '.join(text_parts)
-                
-                # Skip if text is too short
-                if len(full_text) < 20:
-                    continue
-                
-                processed_article = {
-                    'text': full_text,
-                    'title': title,
-                    'description': description or content,
-                    'source': article.get('source', {}).get('name', 'Unknown'),
-                    'url': article.get('url', ''),
-                    'published_at': article.get('publishedAt', '')
-                }
-                
-                processed_articles.append(processed_article)
+                # gather() keeps page order
+                for data in await asyncio.gather(*(fetch(page) for page in range(2, pages + 1))):
+                    if data is None:
+                        # Plan limit reached, keep what we have
+                        break
+                    articles.extend(self._process_articles(data.get('articles', []), seen_urls))
             
-            return processed_articles
+            return articles[:limit]
         
-        except requests.exceptions.Timeout:
+        except httpx.TimeoutException:
             raise Exception('Request timed out. Please try again.')
-        except requests.exceptions.RequestException as e:
+        except httpx.HTTPError as e:
             raise Exception(f'Network error: {str(e)}')
         except Exception as e:
             if 'News API' in str(e):
                 raise
             raise Exception(f'Error scraping news: {str(e)}')
+    
+    async def _afetch_page(self, topic, page, page_size, from_date, to_date):
+        """Async variant of _fetch_page"""
+        with metrics.stage('news_api'):
+            response = await self._aget(self._page_params(topic, page, page_size, from_date, to_date))
+        return self._parse_response(response, page)
+    
+    def _page_params(self, topic, page, page_size, from_date, to_date, sort_by='relevancy'):
+        """Query parameters for one page of results"""
+        # Make API request with improved parameters
+        return {
+            'q': topic,  # Search query
+            'apiKey': self.api_key,
+            'language': self.language,
+            'sortBy': sort_by,  # Relevance by default; publishedAt for incremental refreshes
+            'pageSize': page_size,
+            'page': page,
+            'from': from_date,
+            'to': to_date
+        }
+    
+    def _parse_response(self, response, page):
+        """
+        Check a News API response (requests or httpx) and decode it
+        Returns the decoded response, or None when a later page is beyond the plan limit
+        """
+        if response.status_code == 426:
+            if page > 1:
+                return None
+            raise Exception('News API requires upgrade. The free tier has limited access. Please try a more general topic.')
+        
+        if response.status_code == 401:
+            raise Exception('Invalid News API key. Please check your NEWS_API_KEY.')
+        
+        if response.status_code == 429:
+            raise Exception('Rate limit exceeded. Please wait a moment and try again.')
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        if data.get('status') != 'ok':
+            error_msg = data.get('message', 'Unknown error from News API')
+            raise Exception(f'News API error: {error_msg}')
+        
+        return data
+    
+    def _fetch_page(self, topic, page, page_size, from_date, to_date, sort_by='relevancy'):
+        """Fetch one page of results (retries are handled by _get)"""
+        with metrics.stage('news_api'):
+            response = self._get(self._page_params(topic, page, page_size, from_date, to_date, sort_by))
+        return self._parse_response(response, page)
+    
+    def _can_retry(self, attempt, delay, deadline):
+        """Whether another attempt is allowed and its wait ends before the retry deadline"""
+        return attempt < self.max_retries and time.monotonic() + delay < deadline
+    
+    def _retry_delay(self, response, attempt):
+        """Seconds to wait before retrying, honouring Retry-After when present"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After', '')
+            if retry_after.isdigit():
+                return int(retry_after)
+        # Full jitter keeps workers that were throttled together from retrying together
+        return random.uniform(0, self.backoff * (2 ** attempt))
+    
+    def _process_articles(self, articles_data, seen_urls):
+        """Turn raw News API articles into Article records, skipping URLs already seen"""
+        for article in articles_data:
+            # Skip articles without content
+            if not article.get('title') and not article.get('description'):
+                continue
+            
+            # Skip duplicates returned on more than one page
+            url = article.get('url') or ''
+            if url:
+                if url in seen_urls:
+                    continue
+                seen_urls.add(url)
+            
+            # Combine title and description for better analysis
+            title = (article.get('title') or '').strip()
+            description = (article.get('description') or '').strip()
+            content = (article.get('content') or '').strip()
+            
+            # Create full text (prioritize description over content)
+            text_parts = []
+            if title:
+                text_parts.append(title)
+            if description:
+                text_parts.append(description)
+            elif content:
+                # Use content if no description, but clean it
+                content_clean = content.split('[+')[0].strip()  # Remove "read more" parts
+                if content_clean:
+                    text_parts.append(content_clean)
+            
+            full_text = '. '.join(text_parts)
+            
+            # Skip if text is too short
+            if len(full_text) < 20:
+                continue
+            
+            yield Article(
+                text=full_text,
+                title=title,
+                description=description or content,
+                source=(article.get('source') or {}).get('name', 'Unknown'),
+                url=url,
+                published_at=article.get('publishedAt', '')
+            )
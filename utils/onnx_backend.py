@@ -0,0 +1,360 @@
+import os
+import json
+import time
+import hashlib
+import threading
+import importlib.util
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Optional inference dependencies, imported by OnnxSentimentModel.load() so
+# that importing this module costs nothing for the other sentiment backends
+RUNTIME_MODULES = ('numpy', 'onnxruntime', 'tokenizers')
+np = None
+onnxruntime = None
+Tokenizer = None
+
+# Model files looked up in the model directory, quantized first
+MODEL_FILES = ('model_quantized.onnx', 'model.onnx')
+
+# Label order of models whose config only names them LABEL_0, LABEL_1, ...
+DEFAULT_LABELS = {
+    2: ('negative', 'positive'),
+    3: ('negative', 'neutral', 'positive')
+}
+
+def missing_dependencies():
+    """Names of the inference dependencies that are not installed (checked without importing them)"""
+    return [name for name in RUNTIME_MODULES if importlib.util.find_spec(name) is None]
+
+def check_dependencies():
+    """Raise Exception if any inference dependency is missing"""
+    missing = missing_dependencies()
+    if missing:
+        raise Exception(f'The onnx sentiment backend requires {", ".join(missing)} to be installed')
+
+def _import_runtime():
+    """Import numpy, onnxruntime and tokenizers into this module"""
+    global np, onnxruntime, Tokenizer
+    if onnxruntime is not None:
+        return
+    check_dependencies()
+    import numpy
+    import onnxruntime as runtime
+    from tokenizers import Tokenizer as tokenizer_class
+    np, Tokenizer, onnxruntime = numpy, tokenizer_class, runtime
+
+def _normalize_label(name):
+    """Map a model label name to positive/negative/neutral (None if unknown)"""
+    name = str(name).lower()
+    for prefix, label in (('pos', 'positive'), ('neg', 'negative'), ('neu', 'neutral')):
+        if name.startswith(prefix):
+            return label
+    return None
+
+def quantize_model(model_dir, source='model.onnx', target='model_quantized.onnx'):
+    """Write a dynamically int8-quantized copy of an exported model (needs onnxruntime)"""
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(
+        os.path.join(model_dir, source),
+        os.path.join(model_dir, target),
+        weight_type=QuantType.QInt8
+    )
+    return os.path.join(model_dir, target)
+
+class OnnxSentimentModel:
+    """
+    Locally stored transformer sentiment classifier run with ONNX Runtime on CPU.
+
+    model_dir holds model_quantized.onnx (or model.onnx), the tokenizer.json of
+    the model and its config.json with id2label, as written by
+    `optimum-cli export onnx --model <name> <model_dir>` followed by
+    quantize_model(model_dir). Nothing is downloaded at runtime.
+
+    Texts are tokenized once and cached by text. Each inference call sorts its
+    texts by token count and runs batches of up to max_batch_size, padded only
+    to the longest text of the batch. With batch_wait_ms > 0, concurrent
+    predict() calls from several threads are collected for up to that long
+    and scored together (dynamic batching). Sessions are created per process
+    on first use, so the model is safe to hold across a fork.
+    """
+
+    def __init__(self, model_dir, max_batch_size=32, max_length=128, threads=None,
+                 inter_op_threads=1, batch_wait_ms=2.0, token_cache_size=20000,
+                 neutral_threshold=0.6):
+        """
+        threads: ONNX Runtime intra-op threads (None lets it use every core)
+        neutral_threshold: two-class models label a text neutral below this probability
+        Raises Exception right away if the inference dependencies are not installed.
+        """
+        check_dependencies()
+
+        self.model_dir = model_dir
+        self.max_batch_size = max_batch_size
+        self.max_length = max_length
+        self.threads = threads
+        self.inter_op_threads = inter_op_threads
+        self.batch_wait_ms = batch_wait_ms
+        self.token_cache_size = token_cache_size
+        self.neutral_threshold = neutral_threshold
+
+        self.model_path = None
+        self.labels = None
+        self._tokenizer = None
+        self._pad_id = 0
+        self._session = None
+        self._session_pid = None
+        self._input_names = ()
+
+        self._token_cache = OrderedDict()
+        self._token_hits = 0
+        self._token_misses = 0
+        self._batches = 0
+        self._texts = 0
+
+        self._lock = threading.Lock()
+        self._pending = []
+        self._pending_count = 0
+        self._pending_ready = threading.Condition(threading.Lock())
+        self._batcher = None
+        self._batcher_pid = None
+
+    def options(self):
+        """Constructor arguments, to create the same model in another process"""
+        return {
+            'model_dir': self.model_dir,
+            'max_batch_size': self.max_batch_size,
+            'max_length': self.max_length,
+            'threads': self.threads,
+            'inter_op_threads': self.inter_op_threads,
+            'batch_wait_ms': self.batch_wait_ms,
+            'token_cache_size': self.token_cache_size,
+            'neutral_threshold': self.neutral_threshold
+        }
+
+    def _find_model(self):
+        for name in MODEL_FILES:
+            path = os.path.join(self.model_dir, name)
+            if os.path.exists(path):
+                return path
+        raise Exception(f'No ONNX model found in {self.model_dir} (expected one of {", ".join(MODEL_FILES)})')
+
+    def fingerprint(self):
+        """Identity of the model and its settings, for result cache keys"""
+        path = self._find_model()
+        config_path = os.path.join(self.model_dir, 'config.json')
+        config = ''
+        if os.path.exists(config_path):
+            with open(config_path, encoding='utf-8') as f:
+                config = f.read()
+        raw = f'{os.path.basename(path)}|{os.path.getsize(path)}|{config}|{self.max_length}|{self.neutral_threshold}'
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+    def _load_labels(self, num_labels):
+        config_path = os.path.join(self.model_dir, 'config.json')
+        id2label = {}
+        if os.path.exists(config_path):
+            with open(config_path, encoding='utf-8') as f:
+                id2label = json.load(f).get('id2label') or {}
+
+        names = [id2label.get(str(i), id2label.get(i)) for i in range(num_labels)]
+        labels = tuple(_normalize_label(name) for name in names)
+        if None in labels:
+            if num_labels not in DEFAULT_LABELS:
+                raise Exception(f'Cannot map model labels {names} to positive/negative/neutral')
+            labels = DEFAULT_LABELS[num_labels]
+        return labels
+
+    def _load_tokenizer(self):
+        tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, 'tokenizer.json'))
+        tokenizer.enable_truncation(max_length=self.max_length)
+        tokenizer.no_padding()
+        padding = tokenizer.padding
+        if padding:
+            self._pad_id = padding.get('pad_id', 0)
+        else:
+            for token in ('<pad>', '[PAD]'):
+                pad_id = tokenizer.token_to_id(token)
+                if pad_id is not None:
+                    self._pad_id = pad_id
+                    break
+        return tokenizer
+
+    @property
+    def loaded(self):
+        return self._session is not None and self._session_pid == os.getpid()
+
+    def load(self):
+        """Load the tokenizer and create this process's inference session"""
+        if self.loaded:
+            return
+
+        with self._lock:
+            if self.loaded:
+                return
+            _import_runtime()
+            if self._tokenizer is None:
+                self._tokenizer = self._load_tokenizer()
+
+            options = onnxruntime.SessionOptions()
+            options.intra_op_num_threads = self.threads or 0
+            options.inter_op_num_threads = self.inter_op_threads
+            options.execution_mode = onnxruntime.ExecutionMode.ORT_SEQUENTIAL
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+            self.model_path = self._find_model()
+            session = onnxruntime.InferenceSession(
+                self.model_path, sess_options=options, providers=['CPUExecutionProvider']
+            )
+            self._input_names = tuple(i.name for i in session.get_inputs())
+            self.labels = self._load_labels(session.get_outputs()[0].shape[-1])
+            self._session = session
+            self._session_pid = os.getpid()
+
+    def predict(self, texts):
+        """
+        Classify texts
+        Returns a list of (label, probability) tuples in the same order as texts
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        self.load()
+        if self.batch_wait_ms <= 0:
+            return self._run(texts)
+
+        future = Future()
+        self._ensure_batcher()
+        with self._pending_ready:
+            self._pending.append((texts, future))
+            self._pending_count += len(texts)
+            self._pending_ready.notify()
+        return future.result()
+
+    def _ensure_batcher(self):
+        """Start the batching thread in this process if it is not running (safe after fork)"""
+        if self._batcher is not None and self._batcher_pid == os.getpid():
+            return
+        with self._lock:
+            if self._batcher is not None and self._batcher_pid == os.getpid():
+                return
+            self._pending = []
+            self._pending_count = 0
+            self._batcher = threading.Thread(target=self._batch_loop, name='sentiment-batcher', daemon=True)
+            self._batcher_pid = os.getpid()
+            self._batcher.start()
+
+    def _batch_loop(self):
+        wait = self.batch_wait_ms / 1000.0
+        while True:
+            with self._pending_ready:
+                while not self._pending:
+                    self._pending_ready.wait()
+                # Give concurrent callers a moment to join, unless a full batch is waiting
+                deadline = time.monotonic() + wait
+                while self._pending_count < self.max_batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._pending_ready.wait(remaining)
+                requests = self._pending
+                self._pending = []
+                self._pending_count = 0
+
+            texts = [text for request_texts, _ in requests for text in request_texts]
+            try:
+                results = self._run(texts)
+            except Exception as e:
+                for _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            start = 0
+            for request_texts, future in requests:
+                future.set_result(results[start:start + len(request_texts)])
+                start += len(request_texts)
+
+    def _encode(self, texts):
+        """Token ids of each text, tokenizing only texts not seen recently"""
+        encodings = [None] * len(texts)
+        missing = []
+        with self._lock:
+            cache = self._token_cache
+            for i, text in enumerate(texts):
+                ids = cache.get(text)
+                if ids is None:
+                    missing.append(i)
+                else:
+                    cache.move_to_end(text)
+                    encodings[i] = ids
+            self._token_hits += len(texts) - len(missing)
+            self._token_misses += len(missing)
+
+        if missing:
+            fresh = self._tokenizer.encode_batch([texts[i] for i in missing])
+            with self._lock:
+                for i, encoding in zip(missing, fresh):
+                    ids = encodings[i] = tuple(encoding.ids)
+                    self._token_cache[texts[i]] = ids
+                while len(self._token_cache) > self.token_cache_size:
+                    self._token_cache.popitem(last=False)
+        return encodings
+
+    def _run(self, texts):
+        """Score texts in length-sorted batches"""
+        encodings = self._encode(texts)
+        order = sorted(range(len(texts)), key=lambda i: len(encodings[i]))
+        results = [None] * len(texts)
+
+        for start in range(0, len(order), self.max_batch_size):
+            batch = order[start:start + self.max_batch_size]
+            probabilities = self._infer([encodings[i] for i in batch])
+            for i, row in zip(batch, probabilities):
+                results[i] = self._label(row)
+
+        with self._lock:
+            self._batches += -(-len(texts) // self.max_batch_size)
+            self._texts += len(texts)
+        return results
+
+    def _infer(self, encodings):
+        """Run one padded batch and return class probabilities"""
+        width = max(len(ids) for ids in encodings) or 1
+        input_ids = np.full((len(encodings), width), self._pad_id, dtype=np.int64)
+        attention_mask = np.zeros((len(encodings), width), dtype=np.int64)
+        for row, ids in enumerate(encodings):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+
+        feed = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        if 'token_type_ids' in self._input_names:
+            feed['token_type_ids'] = np.zeros_like(input_ids)
+        feed = {name: value for name, value in feed.items() if name in self._input_names}
+
+        logits = self._session.run(None, feed)[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    def _label(self, probabilities):
+        """Turn one row of class probabilities into (label, probability)"""
+        best = int(probabilities.argmax())
+        probability = float(probabilities[best])
+        if len(self.labels) == 2 and probability < self.neutral_threshold:
+            # Two-class models have no neutral class: treat uncertain texts as neutral
+            return 'neutral', round(1.0 - abs(float(probabilities[0]) - float(probabilities[1])), 3)
+        return self.labels[best], probability
+
+    def stats(self):
+        """Return batching and tokenization cache counters for this process"""
+        lookups = self._token_hits + self._token_misses
+        return {
+            'loaded': self.loaded,
+            'model': os.path.basename(self.model_path) if self.model_path else None,
+            'threads': self.threads,
+            'texts': self._texts,
+            'batches': self._batches,
+            'avg_batch_size': round(self._texts / self._batches, 2) if self._batches else 0.0,
+            'token_cache_entries': len(self._token_cache),
+            'token_cache_hit_rate': round(self._token_hits / lookups, 4) if lookups else 0.0
+        }
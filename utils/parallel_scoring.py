@@ -0,0 +1,124 @@
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from utils.sentiment_analyzer import SentimentAnalyzer
+
+# Analyzer owned by each pool worker, created once when the worker starts
+_worker_analyzer = None
+
+def _init_worker(backend='textblob', model_options=None):
+    """Create the warm analyzer instance for a pool worker"""
+    global _worker_analyzer
+    _worker_analyzer = SentimentAnalyzer(backend=backend, model_options=model_options)
+    # Load the TextBlob lexicon (or the model) now rather than on the first real chunk
+    _worker_analyzer.preload()
+
+def _score_chunk(texts):
+    """Score one chunk of texts inside a pool worker"""
+    return _worker_analyzer.analyze_batch(texts)
+
+def default_workers(server_workers=1):
+    """Pool size that splits the cores between server_workers processes (at least 1)"""
+    return max(1, (os.cpu_count() or 1) // max(1, server_workers))
+
+def _ping(_):
+    """No-op task used to start every worker ahead of the first request"""
+    return os.getpid()
+
+class ParallelScorer:
+    """
+    Score texts with a SentimentAnalyzer, either in-process ('serial' mode) or
+    fanned out over a persistent process pool ('process' mode).
+    Small batches are always scored in-process since IPC would cost more than it saves.
+    Every server worker process gets its own pool of `workers` processes.
+    """
+
+    MODES = ('serial', 'process')
+
+    def __init__(self, analyzer, mode='serial', workers=None, min_batch_size=40,
+                 min_chunk_size=10, start_method='spawn'):
+        if mode not in self.MODES:
+            raise ValueError(f'Unknown scoring mode: {mode}')
+
+        self.analyzer = analyzer
+        self.mode = mode
+        self.workers = workers or default_workers()
+        self.min_batch_size = min_batch_size
+        self.min_chunk_size = min_chunk_size
+        self.start_method = start_method
+
+        self._pool = None
+        self._pool_pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        """Return the process pool, creating it on first use in this process"""
+        with self._lock:
+            # A pool inherited through fork (e.g. gunicorn workers) is not usable
+            if self._pool is None or self._pool_pid != os.getpid():
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=_init_worker,
+                    initargs=(self.analyzer.backend, self.analyzer.model_options)
+                )
+                self._pool_pid = os.getpid()
+            return self._pool
+
+    def warm_up(self):
+        """Start all pool workers so the first request does not pay for it"""
+        # With fewer than two workers scoring stays in-process, so no pool is needed
+        if self.mode == 'process' and self.workers >= 2:
+            list(self._get_pool().map(_ping, range(self.workers)))
+
+    def _chunks(self, texts):
+        """Split texts into about two chunks per worker"""
+        size = max(self.min_chunk_size, -(-len(texts) // (self.workers * 2)))
+        return [texts[i:i + size] for i in range(0, len(texts), size)]
+
+    def score(self, texts):
+        """
+        Analyze sentiment for a list of texts
+        Returns a list of dicts in the same order as texts
+        """
+        texts = list(texts)
+        # Only texts missing from the analyzer's cache are sent to the workers
+        results = self.analyzer.cached_results(texts)
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        
+        missing_texts = [texts[i] for i in missing]
+        scored = self._score_uncached(missing_texts)
+        self.analyzer.store_results(missing_texts, scored)
+        
+        for i, result in zip(missing, scored):
+            results[i] = result
+        return results
+
+    def _score_uncached(self, texts):
+        """Score texts in-process or on the pool depending on mode and batch size"""
+        if self.mode == 'serial' or self.workers < 2 or len(texts) < self.min_batch_size:
+            return self.analyzer.analyze_batch(texts, use_cache=False)
+
+        try:
+            results = []
+            # map() yields chunk results in submission order
+            for chunk_results in self._get_pool().map(_score_chunk, self._chunks(texts)):
+                results.extend(chunk_results)
+            return results
+        except BrokenProcessPool as e:
+            print(f"Scoring pool failed, falling back to in-process scoring: {e}")
+            self.shutdown()
+            return self.analyzer.analyze_batch(texts, use_cache=False)
+
+    def shutdown(self):
+        """Stop the pool workers"""
+        with self._lock:
+            if self._pool is not None and self._pool_pid == os.getpid():
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            self._pool_pid = None
@@ -0,0 +1,185 @@
+import os
+import time
+import heapq
+import threading
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; every process refreshes on its own
+    fcntl = None
+
+class PrefetchScheduler:
+    """
+    Background refresher for trending topics.
+
+    Topic requests are counted with exponential decay. Every interval, the
+    hottest top_n topics whose cached results expire within refresh_margin
+    seconds (or have already expired) are refreshed on a small thread pool.
+    A token bucket of quota_per_hour News API requests caps the background
+    traffic, and max_concurrency bounds how many refreshes run at once, so
+    prefetching never competes much with interactive requests.
+
+    With leader_lock set, only the process holding that file lock refreshes
+    (the others just count requests and take over if it exits), so the quota
+    applies to all workers sharing the lock rather than to each of them. The
+    leader ranks topics by the requests it served itself.
+    """
+
+    def __init__(self, refresh, ttl_remaining, top_n=10, interval=30, refresh_margin=120,
+                 max_concurrency=2, quota_per_hour=100, cost_per_refresh=1, decay=0.9,
+                 leader_lock=None):
+        """
+        refresh: callable(topic) that re-fetches and re-scores a topic
+        ttl_remaining: callable(topic) returning seconds until its cached results expire (None if not cached)
+        leader_lock: path of the lock file electing one refreshing process (None: every process refreshes)
+        """
+        self.refresh = refresh
+        self.ttl_remaining = ttl_remaining
+        self.top_n = top_n
+        self.interval = interval
+        self.refresh_margin = refresh_margin
+        self.max_concurrency = max_concurrency
+        self.quota_per_hour = quota_per_hour
+        self.cost_per_refresh = cost_per_refresh
+        self.decay = decay
+        self.leader_lock = leader_lock if fcntl is not None else None
+
+        self.refreshed = 0
+        self.failed = 0
+        self.skipped_for_quota = 0
+
+        self._scores = {}
+        self._topics = {}
+        self._in_flight = set()
+        self._tokens = float(quota_per_hour)
+        self._tokens_updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._executor = None
+        self._pid = None
+        self._leader_file = None
+        self._leader_pid = None
+
+    def record(self, key, topic):
+        """Count a request for a topic (key is its normalized form)"""
+        with self._lock:
+            self._scores[key] = self._scores.get(key, 0.0) + 1.0
+            self._topics[key] = topic
+
+    def ensure_started(self):
+        """Start the background thread in this process if it is not running (safe after fork)"""
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='prefetch'
+            )
+            self._thread = threading.Thread(target=self._run, name='prefetch-scheduler', daemon=True)
+            self._pid = os.getpid()
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread"""
+        self._stop.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def is_leader(self):
+        """Whether this process runs the refreshes, taking the leader lock if it is free"""
+        if self.leader_lock is None:
+            return True
+        if self._leader_file is not None and self._leader_pid == os.getpid():
+            return True
+
+        lock_file = open(self.leader_lock, 'a')
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        # Held (and never released) until this process exits
+        self._leader_file = lock_file
+        self._leader_pid = os.getpid()
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.tick(refresh=self.is_leader())
+            except Exception as e:
+                print(f"Prefetch scheduler error: {e}")
+
+    def _take_tokens(self, cost):
+        """Spend quota from the token bucket; returns False if there is not enough"""
+        now = time.monotonic()
+        refill = (now - self._tokens_updated) * self.quota_per_hour / 3600.0
+        self._tokens = min(float(self.quota_per_hour), self._tokens + refill)
+        self._tokens_updated = now
+        if self._tokens < cost:
+            return False
+        self._tokens -= cost
+        return True
+
+    def hot_topics(self):
+        """Return the top_n (key, score) pairs by decayed request count"""
+        with self._lock:
+            return heapq.nlargest(self.top_n, self._scores.items(), key=itemgetter(1))
+
+    def tick(self, refresh=True):
+        """Refresh hot topics that are about to expire (unless refresh is False), then decay the counts"""
+        for key, _ in (self.hot_topics() if refresh else ()):
+            with self._lock:
+                if key in self._in_flight or len(self._in_flight) >= self.max_concurrency:
+                    continue
+                topic = self._topics[key]
+
+            remaining = self.ttl_remaining(topic)
+            if remaining is not None and remaining > self.refresh_margin:
+                continue
+
+            with self._lock:
+                if not self._take_tokens(self.cost_per_refresh):
+                    self.skipped_for_quota += 1
+                    break
+                self._in_flight.add(key)
+            self._executor.submit(self._refresh, key, topic)
+
+        with self._lock:
+            for key in list(self._scores):
+                self._scores[key] *= self.decay
+                # Forget topics nobody has asked for in a long while
+                if self._scores[key] < 0.05 and key not in self._in_flight:
+                    del self._scores[key]
+                    del self._topics[key]
+
+    def _refresh(self, key, topic):
+        try:
+            self.refresh(topic)
+            self.refreshed += 1
+        except Exception as e:
+            self.failed += 1
+            print(f"Prefetch of {topic!r} failed: {e}")
+        finally:
+            with self._lock:
+                self._in_flight.discard(key)
+
+    def stats(self):
+        """Return scheduler counters and the current hot topics"""
+        return {
+            'running': self._thread is not None and self._pid == os.getpid() and not self._stop.is_set(),
+            'leader': self.leader_lock is None or (self._leader_file is not None and self._leader_pid == os.getpid()),
+            'tracked_topics': len(self._scores),
+            'hot_topics': [self._topics.get(key, key) for key, _ in self.hot_topics()],
+            'in_flight': len(self._in_flight),
+            'refreshed': self.refreshed,
+            'failed': self.failed,
+            'skipped_for_quota': self.skipped_for_quota,
+            'quota_remaining': int(self._tokens)
+        }
@@ -1,9 +1,38 @@
-from textblob import TextBlob
 import re
+import json
+import hashlib
+import threading
+
+from utils.lexicon_matcher import LexiconMatcher
+from utils.lexicon_scorer import LexiconScorer
+from utils.onnx_backend import OnnxSentimentModel
+
+# Guards the lazy TextBlob import when several threads score at once
+_backend_lock = threading.Lock()
+
+class FallbackResult(dict):
+    """Result of the keyword fallback after a backend error; never stored in the cache"""
 
 class SentimentAnalyzer:
-    def __init__(self):
-        """Initialize sentiment analyzer using TextBlob with enhanced accuracy"""
+    # Bump when the scoring logic changes so cached results are invalidated
+    SCORING_VERSION = 1
+    
+    # Polarity backends: TextBlob's pattern analyzer, the faster token-based LexiconScorer,
+    # or a local ONNX transformer classifier that labels texts directly
+    BACKENDS = ('textblob', 'lexicon', 'onnx')
+    
+    def __init__(self, cache=None, backend='textblob', model_options=None):
+        """
+        Initialize sentiment analyzer using TextBlob with enhanced accuracy
+        model_options: OnnxSentimentModel arguments (model_dir, threads, ...) for the onnx backend
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f'Unknown sentiment backend: {backend}')
+        if backend == 'onnx' and not (model_options or {}).get('model_dir'):
+            raise ValueError('The onnx sentiment backend needs a model_dir')
+        self.backend = backend
+        self.model_options = model_options if backend == 'onnx' else None
+        
         # Enhanced word lists for better detection
         self.strong_positive = [
             'excellent', 'outstanding', 'exceptional', 'brilliant', 'fantastic',
@@ -31,6 +60,102 @@ class SentimentAnalyzer:
             'innovation', 'progress', 'advance', 'celebrate', 'honor', 'award',
             'recovery', 'solution', 'agreement', 'peace', 'cooperation'
         ]
+        
+        # Polarity thresholds for positive/negative labels
+        self.positive_threshold = 0.05
+        self.negative_threshold = -0.05
+        
+        # Optional TTLCache/SQLiteCache of results keyed by content hash (see utils.cache)
+        self.cache = cache
+        
+        # TextBlob is imported on first use (see polarity_analyzer and preload)
+        self._polarity_analyzer = None
+        self.lexicon_scorer = LexiconScorer() if backend == 'lexicon' else None
+        self.model = OnnxSentimentModel(**model_options) if backend == 'onnx' else None
+        
+        self.compile_lexicons()
+    
+    @property
+    def polarity_analyzer(self):
+        """Shared TextBlob polarity backend (same scores as TextBlob(text).sentiment), created on first use"""
+        analyzer = self._polarity_analyzer
+        if analyzer is None:
+            with _backend_lock:
+                if self._polarity_analyzer is None:
+                    from textblob.sentiments import PatternAnalyzer
+                    self._polarity_analyzer = PatternAnalyzer()
+                analyzer = self._polarity_analyzer
+        return analyzer
+    
+    @property
+    def backend_loaded(self):
+        """Whether the polarity backend is ready (TextBlob imported or model session created, if used)"""
+        if self.model is not None:
+            return self.model.loaded
+        return self.backend != 'textblob' or self._polarity_analyzer is not None
+    
+    def preload(self):
+        """Import TextBlob and load its lexicon (or load the model) now instead of on the first request"""
+        if self.backend == 'textblob':
+            self.polarity_analyzer.analyze('Preloading the sentiment lexicon')
+        elif self.model is not None:
+            self.model.load()
+    
+    def compile_lexicons(self):
+        """Compile the word lists into one matcher (call again after editing them)"""
+        self.matcher = LexiconMatcher({
+            'strong_positive': self.strong_positive,
+            'strong_negative': self.strong_negative,
+            'positive_context': self.positive_context,
+            'negative_context': self.negative_context
+        })
+        self.fingerprint = self._fingerprint()
+    
+    def _fingerprint(self):
+        """Hash of everything that affects scores, used to invalidate cached results"""
+        config = {
+            'version': self.SCORING_VERSION,
+            'backend': self.backend,
+            'lexicon': self.lexicon_scorer.config() if self.lexicon_scorer is not None else None,
+            'model': self.model.fingerprint() if self.model is not None else None,
+            'strong_positive': self.strong_positive,
+            'strong_negative': self.strong_negative,
+            'positive_context': self.positive_context,
+            'negative_context': self.negative_context,
+            'thresholds': [self.positive_threshold, self.negative_threshold]
+        }
+        return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:12]
+    
+    def cache_key(self, text):
+        """Cache key for a text: analyzer fingerprint plus content hash"""
+        digest = hashlib.sha1(str(text).encode('utf-8', 'surrogatepass')).hexdigest()
+        return f'sentiment|{self.fingerprint}|{digest}'
+    
+    def cached_results(self, texts):
+        """Return cached results for texts, with None for every miss"""
+        if self.cache is None:
+            return [None] * len(texts)
+        results = []
+        for text in texts:
+            cached = self.cache.get(self.cache_key(text)) if text else None
+            results.append(dict(cached) if cached is not None else None)
+        return results
+    
+    def store_results(self, texts, results):
+        """Store freshly computed results in the cache (fallback results are skipped so they are retried)"""
+        if self.cache is None:
+            return
+        for text, result in zip(texts, results):
+            if text and not isinstance(result, FallbackResult):
+                self.cache.set(self.cache_key(text), dict(result))
+    
+    def cache_stats(self):
+        """Return hit/miss counters of the result cache (None if caching is disabled)"""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def model_stats(self):
+        """Return batching counters of the onnx model (None for the other backends)"""
+        return self.model.stats() if self.model is not None else None
     
     def clean_text(self, text):
         """Clean text for sentiment analysis"""
@@ -55,6 +180,36 @@ class SentimentAnalyzer:
         Analyze sentiment of text using TextBlob with enhanced accuracy
         Returns: dict with 'label' (positive/negative/neutral) and 'score' (confidence)
         """
+        if self.cache is None:
+            return self._analyze_many([text])[0]
+        return self.analyze_batch([text])[0]
+    
+    def _analyze_many(self, texts):
+        """Score texts, bypassing the cache (one model call for the onnx backend)"""
+        if self.model is not None:
+            return self._analyze_with_model(texts)
+        analyze = self._analyze
+        return [analyze(text) for text in texts]
+    
+    def _analyze_with_model(self, texts):
+        """Label texts with the onnx model, using its class probability as the score"""
+        cleaned = [self.clean_text(text) for text in texts]
+        results = [{'label': 'neutral', 'score': 0.5} for _ in texts]
+        todo = [i for i, text in enumerate(cleaned) if len(text) >= 3]
+        
+        try:
+            predictions = self.model.predict([cleaned[i] for i in todo])
+        except Exception as e:
+            print(f"Sentiment model error: {e}")
+            # Fallback to enhanced keyword matching
+            return [FallbackResult(self._enhanced_sentiment(text)) for text in texts]
+        
+        for i, (label, probability) in zip(todo, predictions):
+            results[i] = {'label': label, 'score': round(probability, 3)}
+        return results
+    
+    def _analyze(self, text):
+        """Score one text, bypassing the cache"""
         try:
             # Clean text
             cleaned_text = self.clean_text(text)
@@ -64,18 +219,17 @@ class SentimentAnalyzer:
             
             text_lower = cleaned_text.lower()
             
-            # Analyze with TextBlob
-            blob = TextBlob(cleaned_text)
-            polarity = blob.sentiment.polarity  # -1 to 1
-            subjectivity = blob.sentiment.subjectivity  # 0 to 1
-            
-            # Check for strong sentiment words
-            strong_pos_count = self.check_word_presence(text_lower, self.strong_positive)
-            strong_neg_count = self.check_word_presence(text_lower, self.strong_negative)
+            if self.lexicon_scorer is not None:
+                polarity, subjectivity = self.lexicon_scorer.score(text_lower)
+            else:
+                # Analyze with TextBlob
+                sentiment = self.polarity_analyzer.analyze(cleaned_text)
+                polarity = sentiment.polarity  # -1 to 1
+                subjectivity = sentiment.subjectivity  # 0 to 1
             
-            # Check for context words
-            pos_context_count = self.check_word_presence(text_lower, self.positive_context)
-            neg_context_count = self.check_word_presence(text_lower, self.negative_context)
+            # Check for strong sentiment and context words in one pass
+            (strong_pos_count, strong_neg_count,
+             pos_context_count, neg_context_count) = self.matcher.count(text_lower)
             
             # Adjust polarity based on context and strong words
             context_adjustment = 0
@@ -97,11 +251,11 @@ class SentimentAnalyzer:
             adjusted_polarity = max(-1, min(1, adjusted_polarity))  # Clamp to [-1, 1]
             
             # More sensitive thresholds for better classification
-            if adjusted_polarity > 0.05:  # Lowered from 0.1
+            if adjusted_polarity > self.positive_threshold:  # Lowered from 0.1
                 label = 'positive'
                 # Calculate confidence based on adjusted polarity
                 score = min(abs(adjusted_polarity) * 1.2, 1.0)
-            elif adjusted_polarity < -0.05:  # Lowered from -0.1
+            elif adjusted_polarity < self.negative_threshold:  # Lowered from -0.1
                 label = 'negative'
                 score = min(abs(adjusted_polarity) * 1.2, 1.0)
             else:
@@ -128,7 +282,27 @@ class SentimentAnalyzer:
         except Exception as e:
             print(f"Sentiment analysis error: {e}")
             # Fallback to enhanced keyword matching
-            return self._enhanced_sentiment(text)
+            return FallbackResult(self._enhanced_sentiment(text))
+    
+    def analyze_batch(self, texts, use_cache=True):
+        """
+        Analyze sentiment for a list of texts
+        Returns a list of dicts in the same order as texts
+        """
+        if self.cache is None or not use_cache:
+            return self._analyze_many(texts)
+        
+        results = self.cached_results(texts)
+        missing = [i for i, result in enumerate(results) if result is None]
+        
+        # Score each distinct missing text once
+        distinct = list(dict.fromkeys(texts[i] for i in missing))
+        scored = dict(zip(distinct, self._analyze_many(distinct)))
+        for i in missing:
+            results[i] = dict(scored[texts[i]])
+        
+        self.store_results(distinct, [scored[text] for text in distinct])
+        return results
     
     def _enhanced_sentiment(self, text):
         """Enhanced fallback sentiment analysis using keyword matching"""
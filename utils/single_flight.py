@@ -0,0 +1,96 @@
+import os
+import hashlib
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; cross-process coalescing is disabled
+    fcntl = None
+
+class _Call:
+    """An in-flight computation that other callers can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Deduplicate concurrent calls for the same key.
+
+    Within a process, the first caller for a key runs the function and every
+    concurrent caller for that key waits and receives the same result (or error).
+    With lock_dir and store set, leaders in different processes also serialize
+    on a per-key file lock, and the winner's result is kept in the shared store
+    for share_ttl seconds so leaders that were waiting on the lock reuse it.
+    """
+
+    def __init__(self, lock_dir=None, store=None, share_ttl=10):
+        self.lock_dir = lock_dir if fcntl is not None else None
+        self.store = store
+        self.share_ttl = share_ttl
+        self.leaders = 0
+        self.followers = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key, fn):
+        """Return fn(), sharing the call with concurrent callers for the same key"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.leaders += 1
+            else:
+                self.followers += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._run(key, fn)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _run(self, key, fn):
+        """Run fn as the leader for key, coordinating with other processes if configured"""
+        if not self.lock_dir:
+            return fn()
+
+        lock_name = hashlib.sha1(key.encode('utf-8')).hexdigest() + '.lock'
+        with open(os.path.join(self.lock_dir, lock_name), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                if self.store is not None:
+                    shared = self.store.get(key)
+                    if shared is not None:
+                        return shared
+                result = fn()
+                if self.store is not None:
+                    self.store.set(key, result, ttl=self.share_ttl)
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def stats(self):
+        """Return how many calls ran the function and how many joined an in-flight call"""
+        return {
+            'leaders': self.leaders,
+            'followers': self.followers,
+            'in_flight': len(self._calls)
+        }
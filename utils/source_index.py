@@ -0,0 +1,78 @@
+import re
+import threading
+
+class SourceIndex:
+    """
+    Precompiled credible-source matcher.
+
+    A source is credible when, after lowercasing and stripping, it equals a
+    known name, contains a known name, or is contained in a known name. This
+    is the same rule as scanning the whole list, answered with:
+      - a hash set for exact names,
+      - one trie-shaped regex for "contains a known name",
+      - a single substring search over all names joined together for
+        "is contained in a known name",
+    and every verdict is memoized per raw source name.
+    """
+
+    def __init__(self, names, max_cached=10000):
+        self.names = sorted({name.lower() for name in names})
+        self.max_cached = max_cached
+
+        self._exact = set(self.names)
+        # Names never contain newlines, so a match in the joined text lies inside one name
+        self._joined = '\n'.join(self.names)
+        self._contains_known = re.compile(self._trie_pattern(self.names)) if self.names else None
+
+        self._verdicts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _trie_pattern(words):
+        """Build a regex matching any of words, factored by common prefixes"""
+        trie = {}
+        for word in words:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node):
+            # Once a word ends, nothing longer is needed to prove a match
+            if '' in node:
+                return ''
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items())]
+            if len(branches) == 1:
+                return branches[0]
+            return '(?:' + '|'.join(branches) + ')'
+
+        return build(trie)
+
+    def _match(self, source_lower):
+        """Apply the matching rule to a normalized source name"""
+        if not self.names:
+            return False
+
+        if source_lower in self._exact:
+            return True
+
+        if self._contains_known is not None and self._contains_known.search(source_lower):
+            return True
+
+        if '\n' in source_lower:
+            return any(source_lower in name for name in self.names)
+        return source_lower in self._joined
+
+    def is_credible(self, source_name):
+        """Check if a source is credible"""
+        if not source_name:
+            return False
+
+        verdict = self._verdicts.get(source_name)
+        if verdict is None:
+            verdict = self._match(source_name.lower().strip())
+            with self._lock:
+                if len(self._verdicts) >= self.max_cached:
+                    self._verdicts.clear()
+                self._verdicts[source_name] = verdict
+        return verdict